@@ -383,17 +383,25 @@ class EditorActions:
             # Mark this as a line copy (store in editor for paste detection)
             self.editor._last_copy_was_line = True
             
-            # Delete the current block
-            cursor.select(QTextCursor.BlockUnderCursor)
-            cursor.removeSelectedText()
-            
-            # Fix: Handle last line case
-            if cursor.atEnd() and cursor.blockNumber() > 0:
-                # Was the last line - move to previous line
-                cursor.deletePreviousChar()  # Remove extra newline
-                cursor.movePosition(QTextCursor.StartOfBlock)
+            # Span to delete: the line and the newline after it
+            start = caret = block.position()
+            next_block = block.next()
+            if next_block.isValid():
+                end = next_block.position()
             else:
-                # Not last line - remove newline after deleted line
-                cursor.deleteChar()
+                # Last line - take the newline before it and land on the
+                # previous line instead
+                end = start + block.length() - 1
+                previous_block = block.previous()
+                if previous_block.isValid():
+                    start -= 1
+                    caret = previous_block.position()
+            
+            cursor.beginEditBlock()
+            cursor.setPosition(start)
+            cursor.setPosition(end, QTextCursor.KeepAnchor)
+            cursor.removeSelectedText()
+            cursor.endEditBlock()
             
+            cursor.setPosition(caret)
             self.editor.setTextCursor(cursor)
@@ -4,13 +4,15 @@ Syntax highlighting implementation using Pygments.
 This module wraps Pygments lexers in a QSyntaxHighlighter for use with Qt.
 """
 
-from typing import Optional
-from PyQt5.QtGui import QSyntaxHighlighter, QTextDocument, QTextCharFormat, QColor, QFont
-from PyQt5.QtCore import Qt
+import functools
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from PyQt5.QtGui import QSyntaxHighlighter, QTextDocument, QTextCharFormat, QColor, QFont, QTextCursor
+from PyQt5.QtCore import Qt, QTimer
 
 try:
     from pygments import lex
-    from pygments.lexers import get_lexer_by_name, PythonLexer
+    from pygments.lexers import get_lexer_by_name
     from pygments.token import Token
     from pygments.style import Style
     from pygments.styles import get_style_by_name
@@ -19,6 +21,61 @@ except ImportError:
     PYGMENTS_AVAILABLE = False
 
 
+# Maximum number of distinct lines whose token spans are kept per highlighter
+LINE_CACHE_SIZE = 4096
+
+# Documents with at least this many lines are highlighted in idle-time chunks
+# after a bulk load (see defer_highlighting) instead of all at once
+INCREMENTAL_HIGHLIGHT_MIN_LINES = 2000
+
+# Blocks highlighted per event-loop turn while catching up
+IDLE_HIGHLIGHT_CHUNK = 200
+
+# Small integer ids for token types, shared by all highlighters; ids are
+# assigned on first sight and never change, so cached spans stay valid
+_TOKEN_IDS: Dict[object, int] = {}
+_TOKEN_TYPES: List[object] = []
+
+
+def _token_id(token_type) -> int:
+    """
+    Get the integer id of a token type, assigning the next one if it's new.
+    
+    Args:
+        token_type: Pygments token type
+        
+    Returns:
+        Index of the token type in _TOKEN_TYPES
+    """
+    token_id = _TOKEN_IDS.get(token_type)
+    if token_id is None:
+        token_id = _TOKEN_IDS[token_type] = len(_TOKEN_TYPES)
+        _TOKEN_TYPES.append(token_type)
+    return token_id
+
+
+# Formats shared by every highlighter using the same Pygments style:
+# style name -> (token type -> format, formats indexed by token id)
+_STYLE_FORMATS: Dict[str, Tuple[Dict[object, QTextCharFormat], List[QTextCharFormat]]] = {}
+
+
+def _get_style_formats(style_name: str) -> Tuple[Dict[object, QTextCharFormat],
+                                                 List[QTextCharFormat]]:
+    """
+    Get the shared format cache and format table of a style.
+    
+    Args:
+        style_name: Name of the Pygments style
+        
+    Returns:
+        Tuple of (format cache, format table), both filled on demand
+    """
+    formats = _STYLE_FORMATS.get(style_name)
+    if formats is None:
+        formats = _STYLE_FORMATS[style_name] = ({}, [])
+    return formats
+
+
 class PygmentsHighlighter(QSyntaxHighlighter):
     """
     Syntax highlighter that uses Pygments lexers.
@@ -42,11 +99,60 @@ class PygmentsHighlighter(QSyntaxHighlighter):
         if not PYGMENTS_AVAILABLE:
             raise ImportError("Pygments is required for syntax highlighting")
         
-        self._lexer = lexer or PythonLexer()
+        self._lexer = lexer or get_lexer_for_language('python')
         self._style = get_style_by_name(style_name) if PYGMENTS_AVAILABLE else None
+        self._style_name = style_name
         self._theme = None  # Initialize theme attribute
-        self._format_cache = {}
+        # Formats by token type and by token id (see _token_id), shared with
+        # other highlighters on the same style
+        self._format_cache, self._format_table = _get_style_formats(style_name)
+        # (id(lexer), line text) -> ((offset, length, token_id), ...)
+        self._line_cache = OrderedDict()
         self._build_format_cache()
+        
+        # Bulk-load deferral: blocks are left plain while _deferred is set
+        # and filled in later, a chunk per event-loop turn. The cursor marks
+        # the next plain block and moves with edits made in the meantime.
+        self._deferred = False
+        self._idle_cursor: Optional[QTextCursor] = None
+        self._idle_timer = QTimer(self)
+        self._idle_timer.setInterval(0)
+        self._idle_timer.timeout.connect(self._highlight_idle_chunk)
+    
+    def defer_highlighting(self) -> None:
+        """
+        Skip highlighting until resume_highlighting() is called.
+        
+        Meant to wrap a bulk load such as setPlainText() on a large
+        document, so the load doesn't lex every line before returning.
+        """
+        self._idle_timer.stop()
+        self._deferred = True
+    
+    def resume_highlighting(self) -> None:
+        """Highlight the blocks skipped since defer_highlighting(), in idle-time chunks."""
+        self._deferred = False
+        document = self.document()
+        if document is None:
+            return
+        self._idle_cursor = QTextCursor(document)
+        self._idle_timer.start()
+    
+    def _highlight_idle_chunk(self) -> None:
+        """Highlight the next IDLE_HIGHLIGHT_CHUNK blocks left plain by a bulk load."""
+        cursor = self._idle_cursor
+        block = cursor.block() if cursor is not None else None
+        for _ in range(IDLE_HIGHLIGHT_CHUNK):
+            if block is None or not block.isValid():
+                break
+            self.rehighlightBlock(block)
+            block = block.next()
+        
+        if block is not None and block.isValid():
+            cursor.setPosition(block.position())
+        else:
+            self._idle_timer.stop()
+            self._idle_cursor = None
     
     def set_lexer(self, lexer) -> None:
         """
@@ -56,6 +162,8 @@ class PygmentsHighlighter(QSyntaxHighlighter):
             lexer: New Pygments lexer instance
         """
         self._lexer = lexer
+        self._line_cache.clear()
+        self._idle_timer.stop()
         self.rehighlight()
     
     def set_style(self, style_name: str) -> None:
@@ -65,9 +173,13 @@ class PygmentsHighlighter(QSyntaxHighlighter):
         Args:
             style_name: Name of Pygments style
         """
+        if style_name == self._style_name:
+            return
         self._style = get_style_by_name(style_name)
-        self._format_cache.clear()
+        self._style_name = style_name
+        self._format_cache, self._format_table = _get_style_formats(style_name)
         self._build_format_cache()
+        self._idle_timer.stop()
         self.rehighlight()
     
     def _build_format_cache(self) -> None:
@@ -161,41 +273,92 @@ class PygmentsHighlighter(QSyntaxHighlighter):
         Args:
             text: The text of the block to highlight
         """
-        if not text or not self._lexer:
+        if not text or not self._lexer or self._deferred:
+            return
+        
+        spans = self._get_line_spans(text)
+        if spans is None:
             return
         
+        table = self._format_table
+        for offset, length, token_id in spans:
+            if token_id >= len(table):
+                self._extend_format_table(token_id)
+            self.setFormat(offset, length, table[token_id])
+    
+    def _extend_format_table(self, token_id: int) -> None:
+        """
+        Fill the format table up to and including a token id.
+        
+        Args:
+            token_id: Token id that must have a format afterwards
+        """
+        table = self._format_table
+        for token_type in _TOKEN_TYPES[len(table):token_id + 1]:
+            table.append(self._get_format_for_token(token_type))
+    
+    def _get_line_spans(self, text: str):
+        """
+        Get the token spans for a line, lexing it only on a cache miss.
+        
+        Spans hold token ids rather than formats, so they survive style
+        and theme changes; only a lexer change invalidates them.
+        
+        Args:
+            text: The text of the line
+            
+        Returns:
+            Tuple of (offset, length, token_id) spans, or None if lexing failed
+        """
+        cache = self._line_cache
+        key = (id(self._lexer), text)
+        spans = cache.get(key)
+        if spans is not None:
+            cache.move_to_end(key)
+            return spans
+        
         # Use Pygments to tokenize the text
         try:
-            tokens = lex(text, self._lexer)
-            
+            result = []
             offset = 0
-            for token_type, value in tokens:
+            for token_type, value in lex(text, self._lexer):
                 length = len(value)
                 if length > 0:
-                    fmt = self._get_format_for_token(token_type)
-                    self.setFormat(offset, length, fmt)
+                    result.append((offset, length, _token_id(token_type)))
                     offset += length
         except Exception:
             # If highlighting fails, just skip it
-            pass
+            return None
+        
+        spans = tuple(result)
+        cache[key] = spans
+        if len(cache) > LINE_CACHE_SIZE:
+            cache.popitem(last=False)
+        return spans
     
     def set_theme(self, theme) -> None:
         """
         Set a theme for syntax highlighting.
         
+        Token formats come from the Pygments style and are shared per
+        style, so switching themes keeps the current format table and
+        doesn't re-highlight the document.
+        
         Args:
             theme: Theme object with color definitions
         """
         self._theme = theme
-        self._format_cache.clear()
-        self._build_format_cache()
-        self.rehighlight()
 
 
+@functools.lru_cache(maxsize=32)
 def get_lexer_for_language(language: str):
     """
     Get a Pygments lexer for a given language name.
     
+    Lexers are cached per language name, so repeated lookups share one
+    instance. Sharing is safe: Pygments keeps lexing state local to each
+    get_tokens() call, and lexers are never reconfigured after creation.
+    
     Args:
         language: Language name (e.g., 'python', 'javascript', 'java')
         
@@ -7,5 +7,6 @@ This module contains pure business logic with minimal Qt dependencies.
 from .search_service import SearchService
 from .decoration_service import DecorationService, DecorationLayer
 from .language_service import LanguageService
+from .plain_text_cache import PlainTextCache
 
-__all__ = ['SearchService', 'DecorationService', 'DecorationLayer', 'LanguageService']
+__all__ = ['SearchService', 'DecorationService', 'DecorationLayer', 'LanguageService', 'PlainTextCache']
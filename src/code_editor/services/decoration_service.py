@@ -5,10 +5,11 @@ Centralized management of text decorations (ExtraSelections) with layer support.
 This fixes the highlighting bugs by providing a single source of truth for decorations.
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 from enum import Enum, auto
+from PyQt5.QtCore import QTimer
 from PyQt5.QtWidgets import QPlainTextEdit
-from PyQt5.QtGui import QColor, QTextCursor
+from PyQt5.QtGui import QColor, QTextCursor, QTextCharFormat
 
 
 class DecorationLayer(Enum):
@@ -22,7 +23,11 @@ class DecorationLayer(Enum):
     CURRENT_LINE = auto()    # Current line highlight
     SEARCH_MATCHES = auto()  # All search matches
     CURRENT_MATCH = auto()   # The currently selected search match
-    
+
+
+# Rendering order of the layers (bottom first)
+_LAYER_ORDER = tuple(sorted(DecorationLayer, key=lambda x: x.value))
+
 
 class Decoration:
     """Represents a single text decoration."""
@@ -41,11 +46,20 @@ class Decoration:
         self.bg_color = bg_color
         self.full_width = full_width
     
-    def to_extra_selection(self):
-        """Convert to QTextEdit.ExtraSelection."""
+    def to_extra_selection(self, fmt: Optional[QTextCharFormat] = None):
+        """
+        Convert to QTextEdit.ExtraSelection.
+        
+        Args:
+            fmt: Prebuilt format matching this decoration's colour and width
+                (shared between decorations); built here if omitted
+        """
         from PyQt5.QtWidgets import QTextEdit
         selection = QTextEdit.ExtraSelection()
         selection.cursor = self.cursor
+        if fmt is not None:
+            selection.format = fmt
+            return selection
         selection.format.setBackground(self.bg_color)
         if self.full_width:
             selection.format.setProperty(
@@ -78,6 +92,44 @@ class DecorationService:
         self._layers: Dict[DecorationLayer, List[Decoration]] = {
             layer: [] for layer in DecorationLayer
         }
+        
+        # ExtraSelections last built per layer; only layers changed since
+        # the previous apply are rebuilt
+        self._selections: Dict[DecorationLayer, list] = {
+            layer: [] for layer in DecorationLayer
+        }
+        self._dirty_layers: Set[DecorationLayer] = set()
+        
+        # Pending schedule_apply(); every call within one event-loop turn
+        # collapses into a single setExtraSelections call
+        self._apply_timer = QTimer(editor)
+        self._apply_timer.setSingleShot(True)
+        self._apply_timer.setInterval(0)
+        self._apply_timer.timeout.connect(self.apply)
+        
+        # (rgba, full_width) -> format shared by all matching decorations
+        self._format_cache: Dict[Tuple[int, bool], QTextCharFormat] = {}
+    
+    def _get_format(self, bg_color: QColor, full_width: bool) -> QTextCharFormat:
+        """
+        Get the shared selection format for a colour and width.
+        
+        Args:
+            bg_color: Background color
+            full_width: If True, the format spans the full line width
+            
+        Returns:
+            Cached QTextCharFormat
+        """
+        key = (bg_color.rgba(), full_width)
+        fmt = self._format_cache.get(key)
+        if fmt is None:
+            fmt = QTextCharFormat()
+            fmt.setBackground(bg_color)
+            if full_width:
+                fmt.setProperty(QTextCharFormat.FullWidthSelection, True)
+            self._format_cache[key] = fmt
+        return fmt
     
     def add_decoration(self, layer: DecorationLayer, cursor: QTextCursor,
                       bg_color: QColor, full_width: bool = False) -> None:
@@ -92,6 +144,7 @@ class DecorationService:
         """
         decoration = Decoration(cursor, bg_color, full_width)
         self._layers[layer].append(decoration)
+        self._dirty_layers.add(layer)
     
     def clear_layer(self, layer: DecorationLayer) -> None:
         """
@@ -100,12 +153,15 @@ class DecorationService:
         Args:
             layer: The layer to clear
         """
-        self._layers[layer].clear()
+        decorations = self._layers[layer]
+        if decorations:
+            decorations.clear()
+            self._dirty_layers.add(layer)
     
     def clear_all(self) -> None:
         """Clear all decorations from all layers."""
         for layer in DecorationLayer:
-            self._layers[layer].clear()
+            self.clear_layer(layer)
     
     def apply(self) -> None:
         """
@@ -113,19 +169,41 @@ class DecorationService:
         
         This method collects decorations from all layers in order
         and applies them to the editor in a single operation.
-        This ensures atomic updates and proper layering.
+        This ensures atomic updates and proper layering. Nothing is sent
+        if no layer changed since the last apply, and a pending
+        schedule_apply() is served by this call.
         """
-        # Collect all decorations in layer order
-        all_decorations = []
-        for layer in sorted(DecorationLayer, key=lambda x: x.value):
-            all_decorations.extend(self._layers[layer])
+        self._apply_timer.stop()
+        if not self._dirty_layers:
+            return
+        
+        # Rebuild ExtraSelections only for the layers that changed
+        get_format = self._get_format
+        for layer in self._dirty_layers:
+            self._selections[layer] = [
+                d.to_extra_selection(get_format(d.bg_color, d.full_width))
+                for d in self._layers[layer]
+            ]
+        self._dirty_layers.clear()
         
-        # Convert to ExtraSelections
-        selections = [d.to_extra_selection() for d in all_decorations]
+        # Collect all selections in layer order
+        selections = []
+        for layer in _LAYER_ORDER:
+            selections.extend(self._selections[layer])
         
         # Apply to editor atomically
         self.editor.setExtraSelections(selections)
     
+    def schedule_apply(self) -> None:
+        """
+        Apply all decorations on the next event-loop turn.
+        
+        For updates driven by frequent events (cursor moves, scrolling):
+        several calls within one turn cost a single setExtraSelections.
+        """
+        if not self._apply_timer.isActive():
+            self._apply_timer.start()
+    
     def get_layer_count(self, layer: DecorationLayer) -> int:
         """
         Get the number of decorations in a layer.
@@ -0,0 +1,50 @@
+"""
+Plain text cache service.
+
+Keeps a copy of the document's plain text between edits so that text scans
+(such as search) don't copy the document out of Qt each time.
+"""
+
+from typing import Optional
+from PyQt5.QtGui import QTextDocument
+
+
+class PlainTextCache:
+    """
+    A cached plain-text copy of a document.
+    
+    The text is copied out of Qt on the first request after an edit and
+    reused until the document changes again.
+    """
+    
+    def __init__(self, document: QTextDocument):
+        """
+        Initialize the plain text cache.
+        
+        Args:
+            document: The QTextDocument to cache
+        """
+        self._document = document
+        self._plain_text: Optional[str] = None
+        document.contentsChange.connect(self._on_contents_change)
+    
+    def _on_contents_change(self, position: int, chars_removed: int,
+                            chars_added: int) -> None:
+        """Drop the cached text when the document text changes."""
+        self.invalidate()
+    
+    def invalidate(self) -> None:
+        """Discard the cached text; it is copied again on the next request."""
+        self._plain_text = None
+    
+    def plain_text(self) -> str:
+        """
+        Get the document's plain text, copying it out of Qt once per edit.
+        
+        Returns:
+            The same string as QTextDocument.toPlainText()
+        """
+        text = self._plain_text
+        if text is None:
+            text = self._plain_text = self._document.toPlainText()
+        return text
@@ -4,11 +4,11 @@ Core code editor widget implementation.
 This module provides the main CodeEditor widget and LineData classes.
 """
 
-from typing import Optional, Any, Dict, List
+from typing import Optional, Any, Dict, List, Tuple
 from PyQt5.QtCore import Qt, pyqtSignal, QRect
 from PyQt5.QtGui import (
     QTextBlockUserData, QColor, QPainter, QTextFormat,
-    QTextCursor, QPaintEvent, QMouseEvent, QResizeEvent, QTextDocument,
+    QTextCursor, QPaintEvent, QMouseEvent, QResizeEvent,
     QKeySequence
 )
 from PyQt5.QtWidgets import QPlainTextEdit, QWidget, QTextEdit, QShortcut
@@ -17,9 +17,10 @@ from PyQt5.QtWidgets import QPlainTextEdit, QWidget, QTextEdit, QShortcut
 from .line_number_area import LineNumberArea
 from .goto_line_overlay import GotoLineOverlay
 from .search_popup import SearchService, SearchPopup
-from ..highlighting.highlighter import PygmentsHighlighter
+from ..highlighting.highlighter import PygmentsHighlighter, INCREMENTAL_HIGHLIGHT_MIN_LINES
 from ..highlighting.theme import ThemeManager, Theme
 from ..services.decoration_service import DecorationService, DecorationLayer
+from ..services.plain_text_cache import PlainTextCache
 from ..controllers.shortcut_controller import EditorActions
 
 # Keep backward compatibility imports from old locations
@@ -106,8 +107,11 @@ class CodeEditor(QPlainTextEdit):
         # Theme management
         self._theme_manager = ThemeManager()
         
+        # Plain text copy shared by text scans, refreshed after edits
+        self._plain_text_cache = PlainTextCache(self.document())
+        
         # Search components
-        self._search_service = SearchService(self.document())
+        self._search_service = SearchService(self.document(), self._get_plain_text)
         self._search_popup: Optional[SearchPopup] = None
         
         # Goto line overlay
@@ -165,6 +169,7 @@ class CodeEditor(QPlainTextEdit):
         self.blockCountChanged.connect(self._update_line_number_area_width)
         self.updateRequest.connect(self._update_line_number_area)
         self.cursorPositionChanged.connect(self._on_cursor_position_changed)
+        self.verticalScrollBar().valueChanged.connect(self._on_scrolled)
     
     def _setup_shortcuts(self) -> None:
         """Setup keyboard shortcuts."""
@@ -225,6 +230,39 @@ class CodeEditor(QPlainTextEdit):
             self._line_number_area_width(), 
             cr.height()
         )
+        # More or fewer lines may be in view now
+        if self._search_service.get_matches():
+            self._refresh_search_decorations()
+            self._decoration_service.schedule_apply()
+    
+    def _on_scrolled(self, _: int) -> None:
+        """Highlight the search matches that scrolled into view."""
+        if self._search_service.get_matches():
+            self._refresh_search_decorations()
+            self._decoration_service.schedule_apply()
+    
+    # ==================== Text API ====================
+    
+    def setPlainText(self, text: str) -> None:
+        """
+        Replace the document text.
+        
+        Large documents are highlighted in idle-time chunks after the load
+        instead of lexing every line before this returns.
+        
+        Args:
+            text: New plain text content
+        """
+        highlighter = self._highlighter
+        if highlighter is None or text.count('\n') < INCREMENTAL_HIGHLIGHT_MIN_LINES:
+            super().setPlainText(text)
+            return
+        
+        highlighter.defer_highlighting()
+        try:
+            super().setPlainText(text)
+        finally:
+            highlighter.resume_highlighting()
     
     # ==================== Line Data API ====================
     
@@ -401,43 +439,67 @@ class CodeEditor(QPlainTextEdit):
         """
         self._search_pattern = pattern
         self._search_regex = regex
-        self._decoration_service.clear_layer(DecorationLayer.SEARCH_MATCHES)
-        
-        if not pattern:
-            self._decoration_service.apply()
-            return 0
-        
-        # Find all matches
-        matches = 0
-        cursor = QTextCursor(self.document())
-        highlight_color = QColor(Qt.yellow)
-        
-        flags = QTextDocument.FindFlags()
-        if regex:
-            # For regex support, we'd need to use QRegExp or QRegularExpression
-            # For now, use plain text
-            pass
-        
-        while True:
-            cursor = self.document().find(pattern, cursor, flags)
-            if cursor.isNull():
-                break
-            
-            self._decoration_service.add_decoration(
-                DecorationLayer.SEARCH_MATCHES,
-                cursor,
-                highlight_color
-            )
-            matches += 1
         
+        # Same engine as the search popup: one scan, highlights for what's in view
+        matches = self._search_service.search(pattern, use_regex=regex)
+        self._refresh_search_decorations()
         self._decoration_service.apply()
         return matches
     
     def clear_search(self) -> None:
         """Clear search highlighting."""
         self._search_pattern = None
+        self._search_service.clear()
+        self._decoration_service.clear_layer(DecorationLayer.CURRENT_MATCH)
         self.clear_decorations('search')
     
+    def _visible_position_range(self) -> Tuple[int, int]:
+        """
+        Get the range of document positions shown in the viewport.
+        
+        Returns:
+            (start, end) positions covering the visible blocks
+        """
+        block = self.firstVisibleBlock()
+        start = block.position()
+        end = start
+        offset = self.contentOffset()
+        height = self.viewport().height()
+        while block.isValid():
+            end = block.position() + block.length()
+            if self.blockBoundingGeometry(block).translated(offset).bottom() >= height:
+                break
+            block = block.next()
+        return start, end
+    
+    def _refresh_search_decorations(self) -> None:
+        """
+        Rebuild search highlights for the matches currently in view.
+        
+        Only the decoration layers are updated; the caller applies them
+        (or schedules the apply, for scroll and resize updates).
+        """
+        self._decoration_service.clear_layer(DecorationLayer.SEARCH_MATCHES)
+        self._decoration_service.clear_layer(DecorationLayer.CURRENT_MATCH)
+        
+        theme = self._theme_manager.get_current_theme()
+        start, end = self._visible_position_range()
+        for match in self._search_service.get_matches_in_range(start, end):
+            self._decoration_service.add_decoration(
+                DecorationLayer.SEARCH_MATCHES,
+                match.cursor,
+                theme.search_match
+            )
+        
+        # Highlight current match distinctly (top layer)
+        current_match = self._search_service.get_current_match()
+        if current_match:
+            self._decoration_service.add_decoration(
+                DecorationLayer.CURRENT_MATCH,
+                current_match.cursor,
+                theme.current_match
+            )
+    
     # ==================== Mode Control ====================
     
     def setEditable(self, editable: bool) -> None:
@@ -460,6 +522,7 @@ class CodeEditor(QPlainTextEdit):
         # Update current line highlighting
         if self._current_line_highlight_enabled:
             self._highlight_current_line()
+            self._decoration_service.schedule_apply()
     
     def mouseDoubleClickEvent(self, event: QMouseEvent) -> None:
         """Handle double-click events."""
@@ -532,6 +595,10 @@ class CodeEditor(QPlainTextEdit):
         """Get the total number of lines in the document."""
         return self.blockCount()
     
+    def _get_plain_text(self) -> str:
+        """Get the document's plain text (cached until the next edit)."""
+        return self._plain_text_cache.plain_text()
+    
     def get_line_text(self, line_number: int) -> Optional[str]:
         """
         Get the text of a specific line.
@@ -600,6 +667,7 @@ class CodeEditor(QPlainTextEdit):
         # Re-highlight current line
         if self._current_line_highlight_enabled:
             self._highlight_current_line()
+            self._decoration_service.apply()
         
         # Update syntax highlighter if present
         if self._highlighter:
@@ -608,7 +676,11 @@ class CodeEditor(QPlainTextEdit):
     # ==================== Current Line Highlighting ====================
     
     def _highlight_current_line(self) -> None:
-        """Highlight the current line (using DecorationService)."""
+        """
+        Highlight the current line (using DecorationService).
+        
+        Only the current-line layer is updated; the caller applies it.
+        """
         self._decoration_service.clear_layer(DecorationLayer.CURRENT_LINE)
         
         if not self.isReadOnly() and self._current_line_highlight_enabled:
@@ -621,7 +693,6 @@ class CodeEditor(QPlainTextEdit):
                 theme.current_line,
                 full_width=True
             )
-            self._decoration_service.apply()
     
     def set_current_line_highlight_enabled(self, enabled: bool) -> None:
         """
@@ -633,6 +704,7 @@ class CodeEditor(QPlainTextEdit):
         self._current_line_highlight_enabled = enabled
         if enabled:
             self._highlight_current_line()
+            self._decoration_service.apply()
         else:
             self.clear_decorations('current_line')
     
@@ -659,17 +731,13 @@ class CodeEditor(QPlainTextEdit):
         last_pattern = self._search_service.get_last_pattern()
         if last_pattern:
             self._search_popup.set_pattern(last_pattern)
-            # Highlight based on last search
-            self._on_search_requested(
-                last_pattern,
-                False,
-                False,
-                False
-            )
-
-
+        
         # Show existing instance (don't recreate)
         self._search_popup.show_popup()
+        
+        if last_pattern:
+            # Highlight based on last search, once, with the popup's options
+            self._search_popup.refresh_search()
     
     def _on_search_requested(self, pattern: str, case_sensitive: bool,
                              use_regex: bool, whole_word: bool) -> None:
@@ -690,35 +758,23 @@ class CodeEditor(QPlainTextEdit):
         count = self._search_service.search(pattern, case_sensitive, use_regex, whole_word)
         
         if count > 0:
-            # Highlight all matches using DecorationService
-            theme = self._theme_manager.get_current_theme()
-            for match in self._search_service.get_matches():
-                self._decoration_service.add_decoration(
-                    DecorationLayer.SEARCH_MATCHES,
-                    match.cursor,
-                    theme.search_match
-                )
-            
-            # Highlight current match distinctly (top layer)
+            # Move editor to current match first, so the highlights are
+            # built for the part of the document that ends up in view
             current_match = self._search_service.get_current_match()
             if current_match:
-                self._decoration_service.add_decoration(
-                    DecorationLayer.CURRENT_MATCH,
-                    current_match.cursor,
-                    theme.current_match
-                )
-                
-                # Move editor to current match
                 self.setTextCursor(current_match.cursor)
                 self.centerCursor()
             
-            # Apply all decorations atomically
+            # Highlight the visible matches using DecorationService
+            self._refresh_search_decorations()
             self._decoration_service.apply()
             
             # Update match count in popup
             if self._search_popup:
                 current_idx = 1
-                self._search_popup.update_match_count(current_idx, count)
+                self._search_popup.update_match_count(
+                    current_idx, count, self._search_service.is_truncated()
+                )
         else:
             # No matches found - show "No results"
             self._decoration_service.apply()
@@ -739,32 +795,26 @@ class CodeEditor(QPlainTextEdit):
     
     def _update_current_match(self, match) -> None:
         """Update highlighting for current match (using DecorationService)."""
-        # Clear current match highlighting layer
-        self._decoration_service.clear_layer(DecorationLayer.CURRENT_MATCH)
-        
-        # Highlight new current match on top layer
-        theme = self._theme_manager.get_current_theme()
-        self._decoration_service.add_decoration(
-            DecorationLayer.CURRENT_MATCH,
-            match.cursor,
-            theme.current_match
-        )
-        
-        # Apply changes atomically
-        self._decoration_service.apply()
-        
-        # Move editor to match
+        # Move editor to match, then highlight what is now in view
         self.setTextCursor(match.cursor)
         self.centerCursor()
+        self._refresh_search_decorations()
+        self._decoration_service.apply()
         
         # Update popup match count
         if self._search_popup:
-            matches = self._search_service.get_matches()
-            current_idx = matches.index(match) + 1 if match in matches else 0
-            self._search_popup.update_match_count(current_idx, len(matches))
+            total = len(self._search_service.get_matches())
+            self._search_popup.update_match_count(
+                self._search_service.get_current_index() + 1, total,
+                self._search_service.is_truncated()
+            )
     
     def _on_search_closed(self) -> None:
         """Handle search popup close (using DecorationService)."""
+        # Drop the results (the pattern is kept for reopening) so scrolling
+        # doesn't bring highlights back
+        self._search_service.clear()
+        
         # Clear all search highlights atomically when closing
         self._decoration_service.clear_layer(DecorationLayer.SEARCH_MATCHES)
         self._decoration_service.clear_layer(DecorationLayer.CURRENT_MATCH)
@@ -870,7 +920,7 @@ class CodeEditor(QPlainTextEdit):
             line_number: Line number to preview (1-based)
         """
         # Move cursor to line as user types (live preview)
-        block = self.document().findBlockByLineNumber(line_number - 1)
+        block = self.document().findBlockByNumber(line_number - 1)
         if block.isValid():
             cursor = self.textCursor()
             cursor.setPosition(block.position())
@@ -890,20 +940,3 @@ class CodeEditor(QPlainTextEdit):
             line_number: Line number (1-based)
         """
         self._actions.jump_to_line(line_number)
-    
-    def copy_line(self) -> None:
-        """
-        Copy the current line to clipboard if no selection.
-        
-        If there's a selection, use Qt's native copy (Ctrl+C).
-        """
-        self._actions.copy_line()
-    
-    def cut_line(self) -> None:
-        """
-        Cut the current line to clipboard if no selection.
-        
-        If there's a selection, use Qt's native cut (Ctrl+X).
-        """
-        if not self.isReadOnly():
-            self._actions.cut_line()
@@ -5,7 +5,7 @@ Provides a VS Code-style inline overlay for jumping to a specific line number.
 """
 
 from PyQt5.QtWidgets import QWidget, QLineEdit, QLabel, QHBoxLayout
-from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtCore import Qt, QEvent, pyqtSignal
 from PyQt5.QtGui import QPalette, QIntValidator
 
 
@@ -123,10 +123,10 @@ class GotoLineOverlay(QWidget):
         
         try:
             line_num = int(text)
-            if line_num < 1:
-                line_num = 1
-            elif line_num > self._max_line:
-                line_num = self._max_line
+            if not 1 <= line_num <= self._max_line:
+                # Enter still clamps; the live preview stays where it is
+                self.info_label.setText("✗ Out of range")
+                return
             self.jumpRequested.emit(line_num)  # Live jump signal
             self.info_label.setText(f"✓ Line {line_num}")
                 
@@ -171,7 +171,7 @@ class GotoLineOverlay(QWidget):
         Returns:
             True if event was handled, False otherwise
         """
-        if obj == self.line_input and event.type() == event.KeyPress:
+        if event.type() == QEvent.KeyPress and obj is self.line_input:
             # Handle Enter
             if event.key() in (Qt.Key_Return, Qt.Key_Enter):
                 self._on_enter()
@@ -4,29 +4,175 @@ Search functionality for the code editor.
 This module provides search service and UI components.
 """
 
-from typing import List, Optional
-from PyQt5.QtCore import Qt, QRegExp, pyqtSignal
-from PyQt5.QtGui import QTextCursor, QTextDocument, QColor
+import bisect
+import functools
+import re
+from typing import Callable, List, Optional
+from PyQt5.QtCore import Qt, QSignalBlocker, QTimer, pyqtSignal
+from PyQt5.QtGui import QTextCursor, QTextDocument, QColor, QKeySequence
 from PyQt5.QtWidgets import (
     QWidget, QHBoxLayout, QLineEdit, QPushButton, 
-    QCheckBox, QLabel, QVBoxLayout
+    QCheckBox, QLabel, QVBoxLayout, QShortcut
 )
 
 
+# Qt enum values used on the key-press path, resolved once at import
+_KEY_RETURN = Qt.Key_Return
+_KEY_ENTER = Qt.Key_Enter
+_KEY_ESCAPE = Qt.Key_Escape
+_SHIFT = Qt.ShiftModifier
+_ALT = Qt.AltModifier
+
+# Quiet period after the last keystroke before live search runs
+SEARCH_DEBOUNCE_MS = 60
+
+# Most matches a single search collects; the label then shows "N+"
+MAX_SEARCH_MATCHES = 10000
+
+# Regexes that match (nearly) every position - rejected before searching
+_TOO_BROAD_PATTERNS = frozenset({".*", ".+", ".?", "^$"})
+
+# Characters outside the BMP (two UTF-16 units in a QTextDocument)
+_ASTRAL_RE = re.compile("[\U00010000-\U0010FFFF]")
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_match_label(current: int, total: int, truncated: bool = False) -> str:
+    """Format the "N of M" match label, reusing strings for recurring pairs."""
+    return f"{current} of {total}+" if truncated else f"{current} of {total}"
+
+
+def _is_word_boundary(text: str, index: int) -> bool:
+    """Check whether ``\\b`` matches before text[index] (word chars as in re)."""
+    before = index > 0 and (text[index - 1].isalnum() or text[index - 1] == "_")
+    after = index < len(text) and (text[index].isalnum() or text[index] == "_")
+    return before != after
+
+
+def _utf16_length(text: str) -> int:
+    """
+    Get the length of a string in UTF-16 code units.
+    
+    QTextDocument positions count UTF-16 code units, so characters outside
+    the BMP (e.g. emoji) take two positions but one Python str index.
+    """
+    if text.isascii():
+        return len(text)
+    return len(text.encode('utf-16-le')) // 2
+
+
+def _iter_line_matches(regex: "re.Pattern", text: str):
+    """
+    Yield the non-empty matches of a pattern that stay within one line.
+    
+    The text is scanned in one pass while no match runs over a line break.
+    Once one does (``\\s+``, ``[^x]+``, ...), the rest of the text is
+    scanned line by line with pos/endpos, so each line is only searched
+    once and the scan stays linear.
+    
+    Args:
+        regex: Compiled search pattern
+        text: Text to search, lines separated by "\\n"
+    """
+    for m in regex.finditer(text):
+        start, end = m.span()
+        if start == end:
+            # Zero-width hits (\b, lookarounds, ...) have nothing to show
+            continue
+        newline = text.find("\n", start, end)
+        if newline == -1:
+            yield m
+            continue
+        # Finish the line this match started on, then go line by line
+        pos, line_end = start, newline
+        break
+    else:
+        return
+    
+    length = len(text)
+    while True:
+        for m in regex.finditer(text, pos, line_end):
+            if m.start() != m.end():
+                yield m
+        if line_end == length:
+            return
+        pos = line_end + 1
+        line_end = text.find("\n", pos)
+        if line_end == -1:
+            line_end = length
+
+
+def _cb_prop(attr: str, doc: str) -> property:
+    """Build a property that reads/writes the checked state of a checkbox attribute."""
+    def fget(self) -> bool:
+        return getattr(self, attr).isChecked()
+
+    def fset(self, value: bool) -> None:
+        getattr(self, attr).setChecked(value)
+
+    return property(fget, fset, doc=doc)
+
+
+@functools.lru_cache(maxsize=128)
+def compile_search(pattern: str, case_sensitive: bool, use_regex: bool,
+                   whole_word: bool) -> "re.Pattern":
+    """
+    Compile a search pattern, caching the result per option set.
+    
+    Live search re-emits the same pattern on every option toggle and
+    keystroke, so repeated requests are served from the cache.
+    
+    Args:
+        pattern: Search pattern
+        case_sensitive: If True, match case
+        use_regex: If True, treat pattern as a regex; otherwise literal text
+        whole_word: If True, only match whole words
+        
+    Patterns use Python ``re`` syntax rather than QRegExp's: ``\\b`` for
+    word boundaries instead of ``\\<``/``\\>``, and inline flags such as
+    ``(?i)`` only at the very start of the pattern.
+    
+    Returns:
+        Compiled pattern (``^``/``$`` match at line boundaries)
+        
+    Raises:
+        re.error: If the pattern is not a valid regex
+    """
+    flags = re.MULTILINE if case_sensitive else re.MULTILINE | re.IGNORECASE
+    body = pattern if use_regex else re.escape(pattern)
+    if whole_word:
+        body = rf"\b(?:{body})\b"
+    return re.compile(body, flags)
+
+
 class SearchMatch:
     """Represents a single search match."""
     
-    def __init__(self, cursor: QTextCursor):
+    __slots__ = ("document", "start", "end", "text")
+    
+    def __init__(self, document: QTextDocument, start: int, end: int,
+                 text: str = ""):
         """
         Initialize a search match.
         
         Args:
-            cursor: QTextCursor positioned at the match
+            document: QTextDocument the match belongs to
+            start: Document position where the match starts
+            end: Document position where the match ends
+            text: The matched text
         """
-        self.cursor = cursor
-        self.start = cursor.selectionStart()
-        self.end = cursor.selectionEnd()
-        self.text = cursor.selectedText()
+        self.document = document
+        self.start = start
+        self.end = end
+        self.text = text
+    
+    @property
+    def cursor(self) -> QTextCursor:
+        """A new QTextCursor selecting the match."""
+        cursor = QTextCursor(self.document)
+        cursor.setPosition(self.start)
+        cursor.setPosition(self.end, QTextCursor.KeepAnchor)
+        return cursor
 
 
 class SearchService:
@@ -34,31 +180,48 @@ class SearchService:
     Service layer for search functionality.
     
     Handles the logic of finding matches in a document without
-    concerning itself with UI.
+    concerning itself with UI. Matches are found with a single regex scan
+    over the document's plain text and kept as positions; cursors are only
+    created for the matches that are actually displayed.
     """
     
-    def __init__(self, document: QTextDocument):
+    def __init__(self, document: QTextDocument,
+                 text_source: Optional[Callable[[], str]] = None):
         """
         Initialize the search service.
         
         Args:
             document: QTextDocument to search in
+            text_source: Callable returning the document's plain text
+                (e.g. a cached copy); defaults to document.toPlainText
         """
         self.document = document
+        self._text_source = text_source or document.toPlainText
         self._matches: List[SearchMatch] = []
+        # Match boundaries in document order, for range lookups
+        self._starts: List[int] = []
+        self._ends: List[int] = []
         self._current_index: int = -1
+        self._truncated: bool = False
         self._last_pattern: str = ""
         self._case_sensitive: bool = False
         self._use_regex: bool = False
         self._whole_word: bool = False
+        # Lowercased copy of the last searched text (case-insensitive search)
+        self._lowered_source: Optional[str] = None
+        self._lowered_text: Optional[str] = None
+        document.contentsChange.connect(self._on_contents_change)
     
     def search(self, pattern: str, case_sensitive: bool = False,
                use_regex: bool = False, whole_word: bool = False) -> int:
         """
         Search for a pattern in the document.
         
+        Matches never span lines: like the per-line search of QTextDocument,
+        a regex match stops at the end of the line it starts on.
+        
         Args:
-            pattern: Search pattern
+            pattern: Search pattern (Python ``re`` syntax if use_regex)
             case_sensitive: If True, search is case-sensitive
             use_regex: If True, treat pattern as regex
             whole_word: If True, match whole words only
@@ -66,8 +229,7 @@ class SearchService:
         Returns:
             Number of matches found
         """
-        self._matches.clear()
-        self._current_index = -1
+        self.clear()
         self._last_pattern = pattern
         self._case_sensitive = case_sensitive
         self._use_regex = use_regex
@@ -76,77 +238,194 @@ class SearchService:
         if not pattern:
             return 0
         
-        # Build search flags
-        flags = QTextDocument.FindFlags()
-        if case_sensitive:
-            flags |= QTextDocument.FindCaseSensitively
-        if whole_word:
-            flags |= QTextDocument.FindWholeWords
+        if not use_regex and "\n" in pattern:
+            # Matches never span lines
+            return 0
         
-        # Find all matches
-        cursor = QTextCursor(self.document)
-        last_position = -1
-        max_iterations = 10000  # Safety limit to prevent infinite loops
-        iteration_count = 0
-        
-        if use_regex:
-            # Use regex search
-            regex = QRegExp(pattern)
-            if not case_sensitive:
-                regex.setCaseSensitivity(Qt.CaseInsensitive)
-            
-            cursor = self.document.find(regex, cursor, flags)
-            while not cursor.isNull() and iteration_count < max_iterations:
-                # Prevent infinite loop with zero-width matches
-                current_pos = cursor.position()
-                if current_pos == last_position:
-                    # Move forward to avoid infinite loop
-                    next_pos = current_pos + 1
-                    # Check if we've reached the end of the document
-                    if next_pos >= self.document.characterCount():
-                        break
-                    cursor.setPosition(next_pos)
-                    cursor = self.document.find(regex, cursor, flags)
-                    iteration_count += 1
-                    continue
-                
-                # Validate cursor position is within document
-                if current_pos < 0 or current_pos >= self.document.characterCount():
-                    break
-                
-                match = SearchMatch(cursor)
-                self._matches.append(match)
-                last_position = current_pos
-                cursor = self.document.find(regex, cursor, flags)
-                iteration_count += 1
-        else:
-            # Use plain text search
-            cursor = self.document.find(pattern, cursor, flags)
-            while not cursor.isNull() and iteration_count < max_iterations:
-                # Prevent infinite loop
-                current_pos = cursor.position()
-                if current_pos == last_position:
-                    break
-                
-                # Validate cursor position
-                if current_pos < 0 or current_pos > self.document.characterCount():
-                    break
-                
-                match = SearchMatch(cursor)
-                self._matches.append(match)
-                last_position = current_pos
-                cursor = self.document.find(pattern, cursor, flags)
-                iteration_count += 1
+        text = self._text_source()
+        spans = None
+        if not use_regex:
+            # Literal search (the common case) skips the regex engine
+            spans = self._find_plain_spans(text, pattern, case_sensitive,
+                                           whole_word)
+        if spans is None:
+            try:
+                regex = compile_search(pattern, case_sensitive, use_regex, whole_word)
+            except re.error:
+                return 0
+            spans = self._find_regex_spans(text, regex)
+        
+        # str indices count code points, document positions count UTF-16
+        # units; they only differ after characters outside the BMP
+        if not text.isascii() and _ASTRAL_RE.search(text):
+            spans = self._to_document_positions(text, spans)
+        
+        document = self.document
+        self._matches = [SearchMatch(document, start, end, matched)
+                         for start, end, matched in spans]
+        self._starts = [span[0] for span in spans]
+        self._ends = [span[1] for span in spans]
         
         if self._matches:
             self._current_index = 0
         
         return len(self._matches)
     
+    def _find_regex_spans(self, text: str, regex: "re.Pattern") -> list:
+        """
+        Collect the non-empty, single-line matches of a compiled pattern.
+        
+        Args:
+            text: Text to search
+            regex: Compiled search pattern
+            
+        Returns:
+            List of (start, end, matched text) spans in str indices
+        """
+        spans = []
+        for m in _iter_line_matches(regex, text):
+            if len(spans) >= MAX_SEARCH_MATCHES:
+                # Safety limit for patterns matching almost everywhere
+                self._truncated = True
+                break
+            spans.append((m.start(), m.end(), m.group()))
+        return spans
+    
+    def _find_plain_spans(self, text: str, pattern: str, case_sensitive: bool,
+                          whole_word: bool = False) -> Optional[list]:
+        """
+        Collect the occurrences of a literal pattern with str.find.
+        
+        Case-insensitive search compares lowercased copies, and only when
+        both the text and the pattern are ASCII: beyond ASCII, str.lower()
+        folds differently from re.IGNORECASE (e.g. "ſ"/"s", "ς"/"σ") and can
+        change the length of the text. Whole-word search checks the
+        characters around each hit the way ``\\b`` would, instead of running
+        an anchored regex.
+        
+        Args:
+            text: Text to search
+            pattern: Literal text to find
+            case_sensitive: If True, match case
+            whole_word: If True, only keep hits with word boundaries at both ends
+            
+        Returns:
+            List of (start, end, matched text) spans in str indices, or
+            None if the regex engine has to handle this search
+        """
+        haystack, needle = text, pattern
+        if not case_sensitive:
+            if not (pattern.isascii() and text.isascii()):
+                return None
+            haystack = self._get_lowered_text(text)
+            needle = pattern.lower()
+        
+        spans = []
+        size = len(needle)
+        find = haystack.find
+        start = find(needle)
+        while start != -1:
+            end = start + size
+            if whole_word and not (_is_word_boundary(text, start)
+                                   and _is_word_boundary(text, end)):
+                # A longer word contains this hit; a later one may still overlap
+                start = find(needle, start + 1)
+                continue
+            if len(spans) >= MAX_SEARCH_MATCHES:
+                self._truncated = True
+                break
+            spans.append((start, end, text[start:end]))
+            start = find(needle, end)
+        return spans
+    
+    def _get_lowered_text(self, text: str) -> str:
+        """
+        Get text.lower(), cached for as long as the same text is searched.
+        
+        Args:
+            text: ASCII text to lowercase
+            
+        Returns:
+            Lowercased text
+        """
+        if text is not self._lowered_source:
+            self._lowered_source = text
+            self._lowered_text = text.lower()
+        return self._lowered_text
+    
+    @staticmethod
+    def _to_document_positions(text: str, spans: list) -> list:
+        """Convert (start, end, text) spans from str indices to document positions."""
+        converted = []
+        index = 0      # str index reached so far
+        position = 0   # matching document position
+        for start, end, matched in spans:
+            position += _utf16_length(text[index:start])
+            doc_start = position
+            position += _utf16_length(matched)
+            index = end
+            converted.append((doc_start, position, matched))
+        return converted
+    
+    def _on_contents_change(self, position: int, chars_removed: int,
+                            chars_added: int) -> None:
+        """Keep match positions in step with edits to the document."""
+        if not self._matches:
+            return
+        edit_end = position + chars_removed
+        delta = chars_added - chars_removed
+        
+        # Matches ending before the edit are untouched, matches starting
+        # after it shift, and matches overlapping it no longer hold
+        first = bisect.bisect_right(self._ends, position)
+        last = bisect.bisect_left(self._starts, edit_end)
+        if chars_removed == 0:
+            # Pure insertion: only a match strictly containing it breaks
+            while last > first and self._starts[last - 1] >= position:
+                last -= 1
+        shifted = self._matches[last:]
+        for match in shifted:
+            match.start += delta
+            match.end += delta
+        
+        current = self._current_index
+        if current >= last:
+            current -= last - first
+        elif current >= first:
+            current = first
+        
+        self._matches[first:] = shifted
+        self._starts = [m.start for m in self._matches]
+        self._ends = [m.end for m in self._matches]
+        self._current_index = min(current, len(self._matches) - 1)
+    
     def get_matches(self) -> List[SearchMatch]:
         """Get all search matches."""
         return self._matches
     
+    def get_matches_in_range(self, start: int, end: int) -> List[SearchMatch]:
+        """
+        Get the matches that overlap a range of document positions.
+        
+        Args:
+            start: First document position of the range
+            end: Document position just past the range
+            
+        Returns:
+            Matches overlapping [start, end), in document order
+        """
+        first = bisect.bisect_right(self._ends, start)
+        last = bisect.bisect_left(self._starts, end)
+        return self._matches[first:last]
+    
+    def is_truncated(self) -> bool:
+        """Check if the last search stopped at MAX_SEARCH_MATCHES."""
+        return self._truncated
+    
+    def get_current_index(self) -> int:
+        """Get the index of the current match (-1 if none)."""
+        return self._current_index
+    
     def get_current_match(self) -> Optional[SearchMatch]:
         """Get the current match."""
         if 0 <= self._current_index < len(self._matches):
@@ -173,8 +452,11 @@ class SearchService:
     
     def clear(self) -> None:
         """Clear all search results."""
-        self._matches.clear()
+        self._matches = []
+        self._starts = []
+        self._ends = []
         self._current_index = -1
+        self._truncated = False
 
 
 class SearchPopup(QWidget):
@@ -190,6 +472,38 @@ class SearchPopup(QWidget):
     previousRequested = pyqtSignal()
     closeRequested = pyqtSignal()
     
+    # Match label styles (compared by identity to skip redundant re-polish)
+    _STYLE_EMPTY = ""
+    _STYLE_RED = "color: #cc0000;"
+    
+    # Shared by all instances so the QSS source is built once per class
+    _STYLESHEET = """
+        SearchPopup {
+            background-color: #f0f0f0;
+            border: 1px solid #999;
+            border-radius: 4px;
+        }
+        QLineEdit {
+            padding: 4px;
+            border: 1px solid #ccc;
+            border-radius: 2px;
+        }
+        QPushButton {
+            padding: 4px;
+            border: 1px solid #ccc;
+            border-radius: 2px;
+            background-color: white;
+        }
+        QPushButton:hover {
+            background-color: #e0e0e0;
+        }
+    """
+    
+    # Search options, bound straight to their checkboxes
+    case_sensitive = _cb_prop("case_checkbox", "Whether matching is case sensitive.")
+    use_regex = _cb_prop("regex_checkbox", "Whether the pattern is a regular expression.")
+    whole_word = _cb_prop("whole_word_checkbox", "Whether only whole words match.")
+    
     def __init__(self, parent: Optional[QWidget] = None):
         """
         Initialize the search popup.
@@ -198,12 +512,34 @@ class SearchPopup(QWidget):
             parent: Parent widget (the editor)
         """
         super().__init__(parent)
+        
+        # Typing restarts the timer; the search runs once typing pauses
+        self._search_debounce = QTimer(self)
+        self._search_debounce.setSingleShot(True)
+        self._search_debounce.setInterval(SEARCH_DEBOUNCE_MS)
+        self._search_debounce.timeout.connect(self._on_search)
+        # (pattern, case, regex, whole_word) of the last search that ran
+        self._last_search_key = None
+        
         self._setup_ui()
         self._last_pattern = ""
         
+        # Last state shown by update_match_count, to skip no-op updates
+        self._last_match_state = None
+        self._current_match_style = self._STYLE_EMPTY
+        
+        # Alt+<key> option toggles
+        self._alt_toggles = {
+            Qt.Key_C: self.case_checkbox,
+            Qt.Key_R: self.regex_checkbox,
+            Qt.Key_W: self.whole_word_checkbox,
+        }
+        self._setup_shortcuts()
+        
         # Make it a floating widget
         self.setWindowFlags(Qt.Widget)
-        self.setAutoFillBackground(True)
+        # Background comes from the stylesheet only (no extra palette fill)
+        self.setAttribute(Qt.WA_StyledBackground, True)
     
     def _setup_ui(self) -> None:
         """Setup the UI components."""
@@ -211,16 +547,21 @@ class SearchPopup(QWidget):
         layout.setContentsMargins(5, 5, 5, 5)
         layout.setSpacing(5)
         
-        # First row: search input and buttons
+        layout.addLayout(self._setup_search_row())
+        layout.addLayout(self._setup_options_row())
+        
+        # Style
+        self.setStyleSheet(self._STYLESHEET)
+    
+    def _setup_search_row(self) -> QHBoxLayout:
+        """Build the first row: search input, match count and buttons."""
         search_row = QHBoxLayout()
         
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Find...")
         self.search_input.setMinimumWidth(200)
         # Live search as user types
-        self.search_input.textChanged.connect(self._on_search)
-        # Install event filter to handle Alt shortcuts when input has focus
-        self.search_input.installEventFilter(self)
+        self.search_input.textChanged.connect(self._search_debounce.start)
         search_row.addWidget(self.search_input)
         
         # Match count label
@@ -249,9 +590,10 @@ class SearchPopup(QWidget):
         close_btn.clicked.connect(self.closeRequested.emit)
         search_row.addWidget(close_btn)
         
-        layout.addLayout(search_row)
-        
-        # Second row: options
+        return search_row
+    
+    def _setup_options_row(self) -> QHBoxLayout:
+        """Build the second row: search option checkboxes."""
         options_row = QHBoxLayout()
         
         self.case_checkbox = QCheckBox("Case (Aa)")
@@ -271,41 +613,62 @@ class SearchPopup(QWidget):
         
         options_row.addStretch()
         
-        layout.addLayout(options_row)
+        return options_row
+    
+    def _setup_shortcuts(self) -> None:
+        """Setup Alt+C / Alt+R / Alt+W option toggles.
         
-        # Style
-        self.setStyleSheet("""
-            SearchPopup {
-                background-color: #f0f0f0;
-                border: 1px solid #999;
-                border-radius: 4px;
-            }
-            QLineEdit {
-                padding: 4px;
-                border: 1px solid #ccc;
-                border-radius: 2px;
-            }
-            QPushButton {
-                padding: 4px;
-                border: 1px solid #ccc;
-                border-radius: 2px;
-                background-color: white;
-            }
-            QPushButton:hover {
-                background-color: #e0e0e0;
-            }
-        """)
+        Scoped to the popup and its children, so they work while the search
+        input has focus. Qt matches shortcuts in C++, so ordinary typing in
+        the input never enters Python. Enter and Escape are not shortcuts:
+        QLineEdit ignores them and they reach keyPressEvent below.
+        """
+        for key, checkbox in self._alt_toggles.items():
+            shortcut = QShortcut(QKeySequence(Qt.ALT + key), self)
+            shortcut.setContext(Qt.WidgetWithChildrenShortcut)
+            shortcut.activated.connect(functools.partial(self._toggle_option, checkbox))
+    
+    def _toggle_option(self, checkbox: QCheckBox) -> None:
+        """Flip a search option checkbox and re-run the search once."""
+        with QSignalBlocker(checkbox):
+            checkbox.setChecked(not checkbox.isChecked())
+        self._on_search()
     
     def _on_search(self) -> None:
         """Handle search request."""
+        self._search_debounce.stop()
+        if self.isHidden():
+            # Closed since the search was requested; nothing to show it in
+            return
         pattern = self.search_input.text()
         self._last_pattern = pattern
-        self.searchRequested.emit(
-            pattern,
-            self.case_checkbox.isChecked(),
-            self.regex_checkbox.isChecked(),
-            self.whole_word_checkbox.isChecked()
-        )
+        case_sensitive = self.case_checkbox.isChecked()
+        use_regex = self.regex_checkbox.isChecked()
+        whole_word = self.whole_word_checkbox.isChecked()
+        
+        # Nothing changed since the last search (e.g. text edited and restored)
+        key = (pattern, case_sensitive, use_regex, whole_word)
+        if key == self._last_search_key:
+            return
+        self._last_search_key = key
+        
+        # Only regex input can fail to compile (literal text is escaped).
+        # compile_search is cached, so the editor's search reuses the result
+        if use_regex and pattern:
+            try:
+                compile_search(pattern, case_sensitive, use_regex, whole_word)
+            except re.error:
+                self._reject_search("Invalid regex")
+                return
+        
+        # Don't send regexes downstream that would match everywhere. Patterns
+        # that can match empty text (a*b?, (foo)?bar, ...) are fine: their
+        # zero-width hits are skipped by the search
+        if use_regex and pattern.strip() in _TOO_BROAD_PATTERNS:
+            self._reject_search("Pattern too broad")
+            return
+        
+        self.searchRequested.emit(pattern, case_sensitive, use_regex, whole_word)
     
     def set_pattern(self, pattern: str) -> None:
         """Set the search pattern."""
@@ -316,86 +679,118 @@ class SearchPopup(QWidget):
         """Get the current search pattern."""
         return self.search_input.text()
     
-    def update_match_count(self, current: int, total: int) -> None:
+    pattern = property(get_pattern, set_pattern, doc="The current search pattern.")
+    
+    def update_match_count(self, current: int, total: int,
+                           truncated: bool = False) -> None:
         """
         Update the match count display.
         
         Args:
             current: Current match index (1-based)
             total: Total number of matches
+            truncated: If True, the search stopped early and total is a
+                lower bound (shown as "N+")
         """
+        # The pattern only matters for the "No results" colour
+        state = (current, total, truncated,
+                 bool(self.search_input.text()) if total == 0 else None)
+        if state == self._last_match_state:
+            return
+        
         if total > 0:
-            self.match_label.setText(f"{current} of {total}")
-            self.match_label.setStyleSheet("")  # Reset style
+            self.match_label.setText(_format_match_label(current, total, truncated))
+            style = self._STYLE_EMPTY  # Reset style
         else:
-            # Show "No results" in red when search has no matches
-            pattern = self.search_input.text()
-            if pattern:  # Only show "No results" if there's a search query
-                self.match_label.setText("No results")
-                self.match_label.setStyleSheet("color: #cc0000;")  # Red text
-            else:
-                self.match_label.setText("No results")
-                self.match_label.setStyleSheet("")  # Reset style
+            # Show "No results" in red only when there's a search query
+            self.match_label.setText("No results")
+            style = self._STYLE_RED if state[3] else self._STYLE_EMPTY
+        
+        # setStyleSheet re-polishes the label, so only call it on a flip
+        if style is not self._current_match_style:
+            self.match_label.setStyleSheet(style)
+            self._current_match_style = style
+        
+        self._last_match_state = state
+    
+    def _reject_search(self, message: str) -> None:
+        """Clear the previous results and explain why the pattern wasn't searched."""
+        # An empty pattern clears the editor's matches and highlights, so
+        # Enter doesn't walk results of an older pattern
+        self.searchRequested.emit("", self.case_sensitive, self.use_regex,
+                                  self.whole_word)
+        self._show_match_error(message)
+    
+    def _show_match_error(self, message: str) -> None:
+        """Show a message in red in the match label instead of a count."""
+        self.match_label.setText(message)
+        if self._current_match_style is not self._STYLE_RED:
+            self.match_label.setStyleSheet(self._STYLE_RED)
+            self._current_match_style = self._STYLE_RED
+        # Label no longer reflects a match count
+        self._last_match_state = None
+    
+    def refresh_search(self) -> None:
+        """Run the current search now, even if nothing changed since the last one."""
+        self._last_search_key = None
+        self._on_search()
+    
+    def flush_pending_search(self) -> None:
+        """Run a debounced search now if one is still waiting."""
+        if self._search_debounce.isActive():
+            self._on_search()
     
     def show_popup(self) -> None:
         """Show the popup and restore last search."""
-        if self._last_pattern:
-            self.search_input.setText(self._last_pattern)
-            # Don't trigger search on restore, it will trigger via textChanged
-        self.show()
-        self.raise_()  # Bring to front
-        self.activateWindow()  # Activate window
-        self.search_input.setFocus(Qt.OtherFocusReason)
-        self.search_input.selectAll()
-    
-    def eventFilter(self, obj, event) -> bool:
-        """Filter events for child widgets to handle shortcuts.
-        
-        This is necessary because keyboard shortcuts need to work even when
-        the search_input has focus.
-        """
-        # Don't process events if popup is hidden
-        if not self.isVisible():
-            return super().eventFilter(obj, event)
-        
-        if obj == self.search_input and event.type() == event.KeyPress:
-            # Handle Alt+C, Alt+R, Alt+W shortcuts
-            if event.modifiers() == Qt.AltModifier:
-                if event.key() == Qt.Key_C:
-                    self.case_checkbox.setChecked(not self.case_checkbox.isChecked())
-                    return True
-                elif event.key() == Qt.Key_R:
-                    self.regex_checkbox.setChecked(not self.regex_checkbox.isChecked())
-                    return True
-                elif event.key() == Qt.Key_W:
-                    self.whole_word_checkbox.setChecked(not self.whole_word_checkbox.isChecked())
-                    return True
-            
-            # Handle Enter/Shift+Enter
-            if event.key() in (Qt.Key_Return, Qt.Key_Enter):
-                if event.modifiers() == Qt.ShiftModifier:
-                    self.previousRequested.emit()
-                else:
-                    self.nextRequested.emit()
-                return True
-            
-            # Handle Escape
-            elif event.key() == Qt.Key_Escape:
-                self.closeRequested.emit()
-                return True
-        
-        return super().eventFilter(obj, event)
+        # The document may have changed while hidden, so don't skip re-searches
+        self._last_search_key = None
+        # Batch text restore, show and selection into a single repaint
+        self.setUpdatesEnabled(False)
+        try:
+            if self._last_pattern:
+                self.search_input.setText(self._last_pattern)
+                # Don't trigger search on restore, it will trigger via textChanged
+            self.show()
+            self.raise_()  # Bring to front
+            self.activateWindow()  # Activate window
+            self.search_input.setFocus(Qt.OtherFocusReason)
+            self.search_input.selectAll()
+        finally:
+            self.setUpdatesEnabled(True)
+    
+    def hideEvent(self, event) -> None:
+        """Drop a debounced search still waiting when the popup closes."""
+        # Not when only the window is hidden: the popup is still open then
+        if self.isHidden():
+            self._search_debounce.stop()
+        super().hideEvent(event)
     
     def keyPressEvent(self, event) -> None:
-        """Handle key press events."""
-        # Don't process events if popup is hidden
-        if not self.isVisible():
+        """Handle key press events.
+        
+        Also receives Enter/Escape/Alt+key typed in search_input, which
+        QLineEdit ignores and propagates to its parent.
+        """
+        key = event.key()
+        
+        # Alt+C/R/W reaching us as plain key presses (the QShortcuts only
+        # fire while the window is active)
+        if event.modifiers() == _ALT and key in self._alt_toggles:
+            self._toggle_option(self._alt_toggles[key])
+            event.accept()
+            return
+        
+        # Don't process events if popup is hidden (isHidden rather than
+        # isVisible: an editor that isn't shown yet still owns its popup)
+        if self.isHidden():
             super().keyPressEvent(event)
             return
         
         # Enter - Next match
-        if event.key() == Qt.Key_Return or event.key() == Qt.Key_Enter:
-            if event.modifiers() == Qt.ShiftModifier:
+        if key == _KEY_RETURN or key == _KEY_ENTER:
+            # Navigate the results of what's typed, not a stale search
+            self.flush_pending_search()
+            if event.modifiers() == _SHIFT:
                 # Shift+Enter - Previous match
                 self.previousRequested.emit()
             else:
@@ -405,28 +800,10 @@ class SearchPopup(QWidget):
             return
         
         # Escape - Close
-        elif event.key() == Qt.Key_Escape:
+        elif key == _KEY_ESCAPE:
             self.closeRequested.emit()
             event.accept()
             return
         
-        # Alt+C - Toggle case sensitivity
-        elif event.key() == Qt.Key_C and event.modifiers() == Qt.AltModifier:
-            self.case_checkbox.setChecked(not self.case_checkbox.isChecked())
-            event.accept()
-            return
-        
-        # Alt+R - Toggle regex
-        elif event.key() == Qt.Key_R and event.modifiers() == Qt.AltModifier:
-            self.regex_checkbox.setChecked(not self.regex_checkbox.isChecked())
-            event.accept()
-            return
-        
-        # Alt+W - Toggle whole word
-        elif event.key() == Qt.Key_W and event.modifiers() == Qt.AltModifier:
-            self.whole_word_checkbox.setChecked(not self.whole_word_checkbox.isChecked())
-            event.accept()
-            return
-        
         # Default behavior
         super().keyPressEvent(event)
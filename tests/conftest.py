@@ -0,0 +1,146 @@
+"""
+Shared pytest fixtures for the CodeEditor tests.
+
+All tests share one QApplication and run on Qt's offscreen platform, so no
+display server is needed.
+"""
+
+import os
+import sys
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# Make the package importable from a source checkout without installing it
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+from PyQt5.QtCore import QMimeData  # noqa: E402
+from PyQt5.QtGui import QTextDocument  # noqa: E402
+from PyQt5.QtWidgets import QApplication  # noqa: E402
+
+from code_editor import CodeEditor  # noqa: E402
+from code_editor.highlighting import get_lexer_for_language  # noqa: E402
+
+
+# Script-style checks that create their own QApplication and run on import;
+# run them directly with python until they are converted to test functions
+collect_ignore = [
+    "final_test.py",
+    "test_alt_shortcuts.py",
+    "test_enhanced.py",
+    "test_goto_width.py",
+    "test_regex_fix.py",
+    "test_search_highlighting_fix.py",
+]
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    """The QApplication shared by the whole test session."""
+    app = QApplication.instance() or QApplication([])
+    yield app
+
+
+@pytest.fixture(scope="session")
+def python_lexer():
+    """
+    The Python lexer, looked up once per session.
+    
+    Editors only read from the lexer they're given, so every test can
+    register the same instance.
+    """
+    return get_lexer_for_language('python')
+
+
+class FakeClipboard:
+    """
+    In-process stand-in for the QClipboard text and MIME data API.
+    
+    Only Python code that looks the clipboard up through
+    QApplication.clipboard() sees it; Qt's own copy()/paste() slots still
+    use the system clipboard.
+    """
+    
+    def __init__(self):
+        """Initialize an empty clipboard."""
+        self._mime_data = QMimeData()
+    
+    def setText(self, text, mode=None):
+        """Replace the clipboard contents with plain text."""
+        mime_data = QMimeData()
+        mime_data.setText(text)
+        self._mime_data = mime_data
+    
+    def text(self, mode=None):
+        """Get the clipboard's plain text ("" if it holds none)."""
+        return self._mime_data.text()
+    
+    def setMimeData(self, mime_data, mode=None):
+        """Replace the clipboard contents with a QMimeData object."""
+        self._mime_data = mime_data
+    
+    def mimeData(self, mode=None):
+        """Get the clipboard's QMimeData."""
+        return self._mime_data
+    
+    def clear(self, mode=None):
+        """Empty the clipboard."""
+        self._mime_data = QMimeData()
+
+
+@pytest.fixture
+def fake_clipboard(qapp, monkeypatch):
+    """Route QApplication.clipboard() to a FakeClipboard for one test."""
+    clipboard = FakeClipboard()
+    monkeypatch.setattr(QApplication, "clipboard", staticmethod(lambda: clipboard))
+    return clipboard
+
+
+@pytest.fixture
+def editor(qapp):
+    """A fresh CodeEditor, destroyed after the test."""
+    widget = CodeEditor()
+    yield widget
+    widget.close()
+    widget.deleteLater()
+
+
+@pytest.fixture
+def code_editor(request, editor, python_lexer):
+    """A Python editor holding the CODE string of the requesting test module."""
+    editor.register_language('python', python_lexer)
+    editor.set_language('python')
+    editor.setPlainText(request.module.CODE)
+    return editor
+
+
+@pytest.fixture
+def popup(qapp, code_editor):
+    """
+    The search popup, opened on code_editor in a shown, active window.
+    
+    The popup is only visible in a shown editor, and its Alt shortcuts only
+    fire while the window is active.
+    """
+    code_editor.show()
+    QApplication.setActiveWindow(code_editor)
+    code_editor.show_search_popup()
+    return code_editor._search_popup
+
+
+@pytest.fixture
+def make_document(qapp):
+    """
+    Build standalone QTextDocuments that report edits like an editor's.
+    
+    QTextDocument only emits contentsChange once it has a layout, as every
+    editor's document does, so the documents are laid out up front.
+    """
+    def make(text):
+        document = QTextDocument(text)
+        document.documentLayout()
+        return document
+    return make
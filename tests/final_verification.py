@@ -5,7 +5,7 @@ from PyQt5.QtCore import Qt
 from PyQt5.QtTest import QTest
 
 from code_editor import CodeEditor
-from code_editor.highlighter import get_lexer_for_language
+from code_editor.highlighting import get_lexer_for_language
 
 app = QApplication([])
 
@@ -35,7 +35,7 @@ print("\n✅ Test 1: Live Search (no Enter needed)")
 editor.show_search_popup()
 popup = editor._search_popup
 popup.search_input.setText("calc")
-app.processEvents()
+popup.flush_pending_search()
 matches = len(editor._search_service.get_matches())
 assert matches > 0, "Live search should find matches"
 print(f"   Found {matches} matches automatically ✓")
@@ -65,6 +65,7 @@ print("\n✅ Test 3: Regex .* crash fix")
 popup.regex_checkbox.setChecked(True)
 popup.search_input.clear()
 popup.search_input.setText(".*")
+popup.flush_pending_search()
 for _ in range(10):
     app.processEvents()
 matches = len(editor._search_service.get_matches())
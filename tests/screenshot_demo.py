@@ -7,7 +7,7 @@ import sys
 from PyQt5.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QWidget
 from PyQt5.QtCore import QTimer
 from code_editor import CodeEditor
-from code_editor.highlighter import get_lexer_for_language
+from code_editor.highlighting import get_lexer_for_language
 
 # Sample Python code to display
 SAMPLE_CODE = """# Multi-Language Code Editor Widget
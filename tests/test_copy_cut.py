@@ -2,79 +2,72 @@
 Test the new copy/cut line features.
 """
 
-import sys
 from PyQt5.QtWidgets import QApplication
-from PyQt5.QtCore import Qt
-from PyQt5.QtTest import QTest
 
-from code_editor import CodeEditor
-from code_editor.highlighter import get_lexer_for_language
 
-app = QApplication([])
-
-print("Testing Copy/Cut Line Features")
-print("=" * 60)
-
-# Create editor
-editor = CodeEditor()
-lexer = get_lexer_for_language('python')
-editor.register_language('python', lexer)
-editor.set_language('python')
-
-# Set test code
-code = """line one
+CODE = """line one
 line two
 line three
 """
-editor.setPlainText(code)
 
-# Test 1: Copy line without selection
-print("\n1. Testing copy_line() without selection...")
-cursor = editor.textCursor()
-cursor.movePosition(cursor.Start)
-editor.setTextCursor(cursor)
-editor.copy_line()
 
-clipboard = app.clipboard()
-copied = clipboard.text()
-assert copied == "line one", f"Expected 'line one', got '{copied}'"
-print("   ✅ Copy line works")
+def test_copy_line_without_selection(code_editor, fake_clipboard):
+    """Ctrl+C without a selection copies the whole line, newline included."""
+    code_editor.copy_line()
+    
+    # Line copies keep their newline so paste_line can insert a whole line
+    assert fake_clipboard.text() == "line one\n"
+    assert code_editor._last_copy_was_line
+
+
+def test_native_copy_with_selection(code_editor):
+    """Copying a selection goes through Qt's own copy."""
+    cursor = code_editor.textCursor()
+    cursor.movePosition(cursor.Right, cursor.KeepAnchor, 4)  # Select "line"
+    code_editor.setTextCursor(cursor)
+    code_editor.copy()  # Native Qt copy
+    
+    assert QApplication.clipboard().text() == "line"
+
 
-# Test 2: Copy with selection (should use native)
-print("\n2. Testing native copy with selection...")
-cursor = editor.textCursor()
-cursor.movePosition(cursor.Start)
-cursor.movePosition(cursor.Right, cursor.KeepAnchor, 4)  # Select "line"
-editor.setTextCursor(cursor)
-editor.copy()  # Native Qt copy
-copied = clipboard.text()
-assert copied == "line", f"Expected 'line', got '{copied}'"
-print("   ✅ Native copy with selection works")
+def test_cut_line_without_selection(code_editor, fake_clipboard):
+    """Ctrl+X without a selection cuts the whole line."""
+    code_editor.cut_line()
+    
+    assert fake_clipboard.text() == "line one\n"
+    remaining = code_editor.toPlainText()
+    assert "line one" not in remaining, "Line should be deleted"
+    assert remaining == "line two\nline three\n"
 
-# Test 3: Cut line without selection
-print("\n3. Testing cut_line() without selection...")
-cursor = editor.textCursor()
-cursor.movePosition(cursor.Start)
-editor.setTextCursor(cursor)
-editor.cut_line()
 
-copied = clipboard.text()
-assert copied == "line one", f"Expected 'line one', got '{copied}'"
+def test_cut_middle_line_is_one_undo_step(code_editor, fake_clipboard):
+    """Cutting a line is undone in one step."""
+    cursor = code_editor.textCursor()
+    cursor.movePosition(cursor.Down)
+    code_editor.setTextCursor(cursor)
+    code_editor.cut_line()
+    
+    assert fake_clipboard.text() == "line two\n"
+    assert code_editor.toPlainText() == "line one\nline three\n"
+    
+    code_editor.document().undo()
+    assert code_editor.toPlainText() == CODE
 
-# Check line was deleted
-remaining = editor.toPlainText()
-assert "line one" not in remaining, "Line should be deleted"
-assert "line two" in remaining, "Other lines should remain"
-print("   ✅ Cut line works")
 
-# Test 4: Public API methods exist
-print("\n4. Testing public API...")
-assert hasattr(editor, 'copy_line')
-assert hasattr(editor, 'cut_line')
-print("   ✅ Public API methods available")
+def test_cut_last_line_takes_preceding_newline(code_editor, fake_clipboard):
+    """Cutting the last line removes the newline before it."""
+    code_editor.setPlainText("line one\nline two")
+    cursor = code_editor.textCursor()
+    cursor.movePosition(cursor.End)
+    code_editor.setTextCursor(cursor)
+    code_editor.cut_line()
+    
+    assert fake_clipboard.text() == "line two\n"
+    assert code_editor.toPlainText() == "line one"
+    assert code_editor.textCursor().position() == 0
 
-print("\n" + "=" * 60)
-print("ALL COPY/CUT TESTS PASSED! ✅")
-print("=" * 60)
 
-sys.exit(0)
+def test_public_api(code_editor):
+    """copy_line and cut_line are part of the public API."""
+    assert callable(code_editor.copy_line)
+    assert callable(code_editor.cut_line)
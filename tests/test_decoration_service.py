@@ -0,0 +1,133 @@
+"""
+Test DecorationService layering and when decorations reach the editor.
+"""
+
+from PyQt5.QtGui import QColor, QTextCursor
+
+from code_editor.services import DecorationLayer
+
+
+RED = QColor(255, 0, 0)
+BLUE = QColor(0, 0, 255)
+
+
+def selected_texts(editor):
+    """The selected text of every ExtraSelection set on the editor."""
+    return [s.cursor.selectedText() for s in editor.extraSelections()]
+
+
+def test_search_highlights_are_set_immediately(editor):
+    """search() and clear_search() update the highlights before returning."""
+    editor.setPlainText("hello world\nhello")
+    assert editor.search("hello") == 2
+    
+    # Both matches plus the current match on top, without an event-loop turn
+    assert selected_texts(editor).count("hello") == 3
+    
+    editor.clear_search()
+    assert "hello" not in selected_texts(editor)
+
+
+def test_add_and_clear_decorations_are_set_immediately(editor):
+    """Line decorations show up and go away before the calls return."""
+    editor.setPlainText("one\ntwo")
+    before = len(editor.extraSelections())
+    
+    editor.add_decoration(1, RED)
+    assert len(editor.extraSelections()) == before + 1
+    assert editor.extraSelections()[0].format.background().color() == RED
+    
+    editor.clear_decorations('custom')
+    assert len(editor.extraSelections()) == before
+
+
+def test_cursor_moves_are_applied_on_the_next_turn(qapp, editor):
+    """Current-line updates from cursor moves wait for the event loop."""
+    editor.setPlainText("one\ntwo\nthree")
+    qapp.processEvents()
+    
+    cursor = editor.textCursor()
+    cursor.movePosition(QTextCursor.End)
+    editor.setTextCursor(cursor)
+    assert editor.extraSelections()[-1].cursor.blockNumber() == 0
+    
+    qapp.processEvents()
+    assert editor.extraSelections()[-1].cursor.blockNumber() == 2
+
+
+def test_layers_apply_in_order(editor):
+    """Higher layers are drawn on top of lower ones."""
+    editor.setPlainText("one\ntwo")
+    service = editor._decoration_service
+    service.clear_all()
+    cursor = QTextCursor(editor.document())
+    service.add_decoration(DecorationLayer.CURRENT_MATCH, cursor, BLUE)
+    service.add_decoration(DecorationLayer.CUSTOM, cursor, RED)
+    service.apply()
+    
+    colors = [s.format.background().color() for s in editor.extraSelections()]
+    assert colors == [RED, BLUE]
+
+
+def test_only_changed_layers_are_rebuilt(editor):
+    """apply() keeps the ExtraSelections of layers that didn't change."""
+    editor.setPlainText("one\ntwo")
+    service = editor._decoration_service
+    cursor = QTextCursor(editor.document())
+    service.add_decoration(DecorationLayer.CUSTOM, cursor, RED)
+    service.add_decoration(DecorationLayer.SEARCH_MATCHES, cursor, BLUE)
+    service.apply()
+    custom = service._selections[DecorationLayer.CUSTOM]
+    search = service._selections[DecorationLayer.SEARCH_MATCHES]
+    
+    service.add_decoration(DecorationLayer.SEARCH_MATCHES, cursor, BLUE)
+    service.apply()
+    
+    assert service._selections[DecorationLayer.CUSTOM] is custom
+    assert service._selections[DecorationLayer.SEARCH_MATCHES] is not search
+    colors = [s.format.background().color() for s in editor.extraSelections()]
+    assert colors.count(RED) == 1 and colors.count(BLUE) == 2
+
+
+def test_apply_without_changes_is_a_no_op(editor, monkeypatch):
+    """apply() leaves the editor alone when no layer changed."""
+    editor.setPlainText("one\ntwo")
+    service = editor._decoration_service
+    service.add_decoration(DecorationLayer.CUSTOM, QTextCursor(editor.document()), RED)
+    service.apply()
+    
+    calls = []
+    monkeypatch.setattr(editor, "setExtraSelections", calls.append)
+    service.apply()
+    service.clear_layer(DecorationLayer.SEARCH_MATCHES)  # already empty
+    service.apply()
+    assert calls == []
+    
+    service.clear_layer(DecorationLayer.CUSTOM)
+    service.apply()
+    assert len(calls) == 1
+
+
+def test_every_change_reaches_the_editor(editor):
+    """Each add or clear is reflected by the next apply()."""
+    editor.setPlainText("one\ntwo")
+    service = editor._decoration_service
+    service.clear_all()
+    service.apply()
+    cursor = QTextCursor(editor.document())
+    
+    service.add_decoration(DecorationLayer.CURRENT_LINE, cursor, RED)
+    service.apply()
+    assert len(editor.extraSelections()) == 1
+    
+    service.add_decoration(DecorationLayer.CUSTOM, cursor, BLUE)
+    service.apply()
+    assert len(editor.extraSelections()) == 2
+    
+    service.clear_layer(DecorationLayer.CURRENT_LINE)
+    service.apply()
+    assert [s.format.background().color() for s in editor.extraSelections()] == [BLUE]
+    
+    service.clear_all()
+    service.apply()
+    assert editor.extraSelections() == []
@@ -1,29 +1,25 @@
 """
 Basic functionality tests for CodeEditor widget.
 
-This script tests the core features without requiring a GUI display.
+These tests cover the core features without requiring a GUI display; the
+shared QApplication and the editor fixture come from conftest.py.
 """
 
 import sys
-from PyQt5.QtWidgets import QApplication
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QColor
 
-from code_editor import CodeEditor, LineData
-from code_editor.highlighter import get_lexer_for_language
+import pytest
+from PyQt5.QtGui import QColor
 
-# Create QApplication (required even for non-GUI tests)
-app = QApplication(sys.argv)
+from code_editor import LineData
+from code_editor.highlighting import get_lexer_for_language
 
-def test_basic_creation():
+def test_basic_creation(editor):
     """Test basic editor creation."""
-    editor = CodeEditor()
     assert editor is not None
     print("✓ Editor creation successful")
 
-def test_line_data():
+def test_line_data(editor):
     """Test line data functionality."""
-    editor = CodeEditor()
     editor.setPlainText("Line 1\nLine 2\nLine 3")
     
     # Create line data
@@ -38,12 +34,10 @@ def test_line_data():
     
     print("✓ Line data creation and retrieval works")
 
-def test_language_registration():
+def test_language_registration(editor, python_lexer):
     """Test language registration and switching."""
-    editor = CodeEditor()
     
     # Register Python language
-    python_lexer = get_lexer_for_language('python')
     editor.register_language('python', python_lexer)
     
     # Set language
@@ -53,9 +47,8 @@ def test_language_registration():
     
     print("✓ Language registration and switching works")
 
-def test_read_only_mode():
+def test_read_only_mode(editor):
     """Test read-only mode switching."""
-    editor = CodeEditor()
     
     # Default is editable
     assert not editor.isReadOnly(), "Editor should start in editable mode"
@@ -70,9 +63,8 @@ def test_read_only_mode():
     
     print("✓ Read-only mode switching works")
 
-def test_search():
+def test_search(editor):
     """Test search functionality."""
-    editor = CodeEditor()
     editor.setPlainText("hello world\nhello python\ntest")
     
     # Search for "hello"
@@ -84,9 +76,8 @@ def test_search():
     
     print("✓ Search functionality works")
 
-def test_decorations():
+def test_decorations(editor):
     """Test decoration functionality."""
-    editor = CodeEditor()
     editor.setPlainText("Line 1\nLine 2\nLine 3")
     
     # Add decoration
@@ -98,9 +89,8 @@ def test_decorations():
     
     print("✓ Decoration system works")
 
-def test_line_operations():
+def test_line_operations(editor):
     """Test line-related operations."""
-    editor = CodeEditor()
     editor.setPlainText("Line 1\nLine 2\nLine 3")
     
     # Test line count
@@ -120,9 +110,8 @@ def test_line_operations():
     
     print("✓ Line operations work")
 
-def test_multiple_languages():
+def test_multiple_languages(editor):
     """Test multiple language support."""
-    editor = CodeEditor()
     
     # Register multiple languages
     languages = ['python', 'javascript', 'java']
@@ -138,37 +127,5 @@ def test_multiple_languages():
     
     print("✓ Multiple language support works")
 
-def run_all_tests():
-    """Run all tests."""
-    print("\n" + "=" * 50)
-    print("Running CodeEditor Tests")
-    print("=" * 50 + "\n")
-    
-    tests = [
-        test_basic_creation,
-        test_line_data,
-        test_language_registration,
-        test_read_only_mode,
-        test_search,
-        test_decorations,
-        test_line_operations,
-        test_multiple_languages,
-    ]
-    
-    for test in tests:
-        try:
-            test()
-        except Exception as e:
-            print(f"✗ {test.__name__} failed: {e}")
-            import traceback
-            traceback.print_exc()
-            return False
-    
-    print("\n" + "=" * 50)
-    print("All tests passed! ✓")
-    print("=" * 50 + "\n")
-    return True
-
 if __name__ == '__main__':
-    success = run_all_tests()
-    sys.exit(0 if success else 1)
+    sys.exit(pytest.main([__file__, "-v"]))
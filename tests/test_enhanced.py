@@ -2,13 +2,12 @@
 Test script for enhanced features.
 """
 
-import sys
 from PyQt5.QtWidgets import QApplication
-from PyQt5.QtCore import QTimer
-from PyQt5.QtGui import QColor
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QColor, QImageWriter, QPixmap
 
 from code_editor import CodeEditor, Theme
-from code_editor.highlighter import get_lexer_for_language
+from code_editor.highlighting import get_lexer_for_language
 
 app = QApplication([])
 
@@ -60,28 +59,30 @@ print("  jump_to_line(5) available")
 print("✓ Testing search popup...")
 print("  show_search_popup() available")
 
-# Show and take screenshot
+# Render screenshots offscreen (no compositor or event loop needed)
+editor.setAttribute(Qt.WA_DontShowOnScreen, True)
 editor.show()
+app.processEvents()
 
-def take_screenshot():
-    pixmap = editor.grab()
-    pixmap.save('/tmp/enhanced_editor_dark.png')
-    print("\n✓ Screenshot saved: /tmp/enhanced_editor_dark.png")
-    
-    # Switch to light theme
-    editor.set_theme('light')
-    QTimer.singleShot(200, take_light_screenshot)
-
-def take_light_screenshot():
-    pixmap = editor.grab()
-    pixmap.save('/tmp/enhanced_editor_light.png')
-    print("✓ Screenshot saved: /tmp/enhanced_editor_light.png")
-    
-    print("\n" + "="*60)
-    print("ALL ENHANCED FEATURES TESTED SUCCESSFULLY!")
-    print("="*60)
-    QTimer.singleShot(100, app.quit)
-
-QTimer.singleShot(500, take_screenshot)
-
-sys.exit(app.exec_())
+
+def save_screenshot(path):
+    pixmap = QPixmap(editor.size())
+    editor.render(pixmap)
+    # Fastest PNG compression; these are throwaway previews
+    writer = QImageWriter(path, b'PNG')
+    writer.setCompression(1)
+    writer.write(pixmap.toImage())
+
+
+save_screenshot('/tmp/enhanced_editor_dark.png')
+print("\n✓ Screenshot saved: /tmp/enhanced_editor_dark.png")
+
+# Switch to light theme
+editor.set_theme('light')
+app.processEvents()
+save_screenshot('/tmp/enhanced_editor_light.png')
+print("✓ Screenshot saved: /tmp/enhanced_editor_light.png")
+
+print("\n" + "="*60)
+print("ALL ENHANCED FEATURES TESTED SUCCESSFULLY!")
+print("="*60)
@@ -1,25 +1,10 @@
 """Test goto line overlay widget."""
-import sys
-from PyQt5.QtWidgets import QApplication
+import pytest
 from PyQt5.QtCore import Qt
 from PyQt5.QtTest import QTest
 
-from code_editor import CodeEditor
-from code_editor.highlighter import get_lexer_for_language
 
-app = QApplication([])
-
-print("=" * 70)
-print("GOTO LINE OVERLAY TEST")
-print("=" * 70)
-
-# Create editor with multiple lines
-editor = CodeEditor()
-lexer = get_lexer_for_language('python')
-editor.register_language('python', lexer)
-editor.set_language('python')
-
-code = """# Line 1
+CODE = """# Line 1
 def function_a():  # Line 2
     pass  # Line 3
 
@@ -33,110 +18,78 @@ def function_c():  # Line 8
 # Line 12
 # Line 13
 """
-editor.setPlainText(code)
-
-# Test 1: Show overlay
-print("\n✅ Test 1: Show goto line overlay")
-editor.go_to_line()
-app.processEvents()
-
-assert editor._goto_line_overlay is not None, "Overlay should be created"
-print("   Overlay created ✓")
-
-# Test 2: Type line number and check live preview
-print("\n✅ Test 2: Live preview as user types")
-overlay = editor._goto_line_overlay
-overlay.line_input.setText("5")
-app.processEvents()
-
-# Check cursor moved to line 5
-cursor = editor.textCursor()
-current_line = cursor.blockNumber() + 1
-assert current_line == 5, f"Should be at line 5, but at {current_line}"
-print(f"   Cursor moved to line {current_line} (live preview) ✓")
-
-# Test 3: Type different line number
-print("\n✅ Test 3: Live preview updates")
-overlay.line_input.setText("8")
-app.processEvents()
-
-cursor = editor.textCursor()
-current_line = cursor.blockNumber() + 1
-assert current_line == 8, f"Should be at line 8, but at {current_line}"
-print(f"   Cursor updated to line {current_line} ✓")
-
-# Test 4: Press Enter confirms position
-print("\n✅ Test 4: Enter keeps current position")
-# The cursor is already at line 8 from live preview
-QTest.keyPress(overlay.line_input, Qt.Key_Return)
-app.processEvents()
-
-# Check we're still at line 8
-cursor = editor.textCursor()
-current_line = cursor.blockNumber() + 1
-assert current_line == 8, f"Should be at line 8, but at {current_line}"
-print(f"   Jump confirmed at line {current_line} ✓")
-
-# Test 5: New invocation - jump to line 3
-print("\n✅ Test 5: Fresh invocation jumps to new line")
-editor.go_to_line()
-app.processEvents()
-overlay.line_input.setText("3")
-app.processEvents()
-
-# Live preview should move to line 3
-cursor = editor.textCursor()
-current_line = cursor.blockNumber() + 1
-assert current_line == 3, f"Should be at line 3, but at {current_line}"
-print(f"   Live preview moved to line {current_line} ✓")
-
-# Test 6: Invalid line number
-print("\n✅ Test 6: Invalid line number handling")
-overlay.line_input.setText("999")
-app.processEvents()
-assert "Out of range" in overlay.info_label.text() or "✗" in overlay.info_label.text()
-print(f"   Invalid feedback: '{overlay.info_label.text()}' ✓")
-
-# Test 7: Valid line number feedback
-print("\n✅ Test 7: Valid line number feedback")
-overlay.line_input.setText("7")
-app.processEvents()
-assert "✓" in overlay.info_label.text() or "Line 7" in overlay.info_label.text()
-print(f"   Valid feedback: '{overlay.info_label.text()}' ✓")
-
-# Test 8: Escape closes overlay
-print("\n✅ Test 8: Escape closes overlay")
-closed = [False]
-def on_closed():
-    closed[0] = True
-overlay.closeRequested.connect(on_closed)
-
-QTest.keyPress(overlay.line_input, Qt.Key_Escape)
-app.processEvents()
-assert closed[0], "Close signal should be emitted"
-print("   Escape triggers close ✓")
-
-# Test 9: Jump via public API
-print("\n✅ Test 9: Jump via public API")
-editor.jump_to_line(10)
-app.processEvents()
-
-cursor = editor.textCursor()
-current_line = cursor.blockNumber() + 1
-assert current_line == 10, f"Should be at line 10, but at {current_line}"
-print(f"   API jump to line {current_line} ✓")
-
-print("\n" + "=" * 70)
-print("ALL TESTS PASSED! ✅")
-print("=" * 70)
-print("\nGoto line overlay features:")
-print("  1. ✅ Overlay created on demand")
-print("  2. ✅ Live preview as you type")
-print("  3. ✅ Enter confirms current position")
-print("  4. ✅ Escape emits close signal")
-print("  5. ✅ Validates line numbers")
-print("  6. ✅ Visual feedback for valid/invalid")
-print("  7. ✅ Public API (jump_to_line) works")
-print("  8. ✅ Positioned at top-center (avoids search popup)")
-
-sys.exit(0)
+
+
+@pytest.fixture
+def overlay(code_editor):
+    """The goto line overlay, opened on code_editor."""
+    code_editor.go_to_line()
+    return code_editor._goto_line_overlay
+
+
+def current_line(editor):
+    """1-based line number of the editor's cursor."""
+    return editor.textCursor().blockNumber() + 1
+
+
+def test_overlay_created_on_demand(code_editor):
+    """The overlay is only created the first time it's opened."""
+    assert code_editor._goto_line_overlay is None
+    code_editor.go_to_line()
+    assert code_editor._goto_line_overlay is not None
+
+
+def test_live_preview(code_editor, overlay):
+    """Typing a line number moves the cursor there right away."""
+    overlay.line_input.setText("5")
+    assert current_line(code_editor) == 5
+    
+    overlay.line_input.setText("8")
+    assert current_line(code_editor) == 8
+
+
+def test_enter_keeps_previewed_line(code_editor, overlay):
+    """Enter leaves the cursor on the previewed line."""
+    overlay.line_input.setText("8")
+    QTest.keyPress(overlay.line_input, Qt.Key_Return)
+    assert current_line(code_editor) == 8
+
+
+def test_fresh_invocation_jumps_to_new_line(code_editor, overlay):
+    """Reopening the overlay previews the newly typed line."""
+    overlay.line_input.setText("8")
+    QTest.keyPress(overlay.line_input, Qt.Key_Return)
+    
+    code_editor.go_to_line()
+    overlay.line_input.setText("3")
+    assert current_line(code_editor) == 3
+
+
+def test_out_of_range_feedback(code_editor, overlay):
+    """An out-of-range number is flagged and doesn't move the cursor."""
+    overlay.line_input.setText("3")
+    overlay.line_input.setText("999")
+    
+    assert "Out of range" in overlay.info_label.text()
+    assert current_line(code_editor) == 3
+
+
+def test_valid_line_feedback(overlay):
+    """A valid line number is confirmed in the info label."""
+    overlay.line_input.setText("7")
+    assert overlay.info_label.text() == "✓ Line 7"
+
+
+def test_escape_emits_close(overlay):
+    """Escape in the input asks to close the overlay."""
+    closed = []
+    overlay.closeRequested.connect(lambda: closed.append(True))
+    
+    QTest.keyPress(overlay.line_input, Qt.Key_Escape)
+    assert closed, "Close signal should be emitted"
+
+
+def test_jump_via_public_api(code_editor):
+    """jump_to_line moves the cursor to a 1-based line."""
+    code_editor.jump_to_line(10)
+    assert current_line(code_editor) == 10
@@ -4,11 +4,12 @@ Test goto line overlay width fix.
 Verifies that "Out of range" text is fully visible.
 """
 
+import os
 import sys
 from PyQt5.QtWidgets import QApplication
 from PyQt5.QtCore import QTimer
 from code_editor import CodeEditor
-from code_editor.highlighter import get_lexer_for_language
+from code_editor.highlighting import get_lexer_for_language
 
 
 def test_goto_overlay_width():
@@ -67,9 +68,14 @@ def test_goto_overlay_width():
         
         print("\n" + "="*60)
         print("Test complete!")
-        print("Overlay will remain open for visual verification...")
-        print("Close window to exit")
+        if os.environ.get('KEEP_OPEN'):
+            print("Overlay will remain open for visual verification...")
+            print("Close window to exit")
         print("="*60)
+        
+        # Quit right away unless KEEP_OPEN=1 asks to keep the window up
+        if not os.environ.get('KEEP_OPEN'):
+            app.quit()
     
     # Start test
     QTimer.singleShot(500, run_test)
@@ -0,0 +1,88 @@
+"""
+Test idle-time highlighting of large documents loaded with setPlainText.
+"""
+
+import pytest
+from PyQt5.QtGui import QTextCursor
+
+from code_editor.highlighting.highlighter import (
+    INCREMENTAL_HIGHLIGHT_MIN_LINES, IDLE_HIGHLIGHT_CHUNK
+)
+
+
+# Enough lines to take the deferred path and several idle chunks
+LINE_COUNT = INCREMENTAL_HIGHLIGHT_MIN_LINES + 3 * IDLE_HIGHLIGHT_CHUNK + 7
+CODE = "\n".join(f"def f{i}(): return {i}" for i in range(LINE_COUNT))
+
+
+def is_highlighted(block):
+    """Check whether the highlighter has set formats on a block."""
+    return bool(block.layout().formats())
+
+
+def plain_blocks(document):
+    """Numbers of the blocks that have no highlighting formats."""
+    numbers = []
+    block = document.firstBlock()
+    while block.isValid():
+        if block.text() and not is_highlighted(block):
+            numbers.append(block.blockNumber())
+        block = block.next()
+    return numbers
+
+
+def run_idle_chunks(qapp, highlighter):
+    """Process events until the highlighter's idle pass is done."""
+    while highlighter._idle_timer.isActive():
+        qapp.processEvents()
+
+
+@pytest.fixture
+def large_editor(qapp, editor, python_lexer):
+    """A Python editor that just loaded CODE (highlighting still pending)."""
+    editor.register_language('python', python_lexer)
+    editor.set_language('python')
+    editor.setPlainText(CODE)
+    return editor
+
+
+def test_large_document_is_highlighted_in_idle_chunks(qapp, large_editor):
+    """A large load is highlighted chunk by chunk after setPlainText returns."""
+    document = large_editor.document()
+    highlighter = large_editor._highlighter
+    assert highlighter._idle_timer.isActive()
+    assert not is_highlighted(document.lastBlock())
+    
+    run_idle_chunks(qapp, highlighter)
+    assert plain_blocks(document) == []
+
+
+def test_small_document_is_highlighted_on_load(editor, python_lexer):
+    """A small load is highlighted before setPlainText returns."""
+    editor.register_language('python', python_lexer)
+    editor.set_language('python')
+    editor.setPlainText("def f(): return 1\n" * 10)
+    
+    assert not editor._highlighter._idle_timer.isActive()
+    assert plain_blocks(editor.document()) == []
+
+
+@pytest.mark.parametrize("removed_lines, inserted", [
+    # Removing lines above the pass pulls pending blocks back past it
+    (IDLE_HIGHLIGHT_CHUNK // 2, ""),
+    # Inserting lines above the pass pushes done blocks forward
+    (0, "x = 1\n" * IDLE_HIGHLIGHT_CHUNK),
+])
+def test_edit_during_idle_pass(qapp, large_editor, removed_lines, inserted):
+    """Edits made while the idle pass runs leave no block unhighlighted."""
+    document = large_editor.document()
+    highlighter = large_editor._highlighter
+    highlighter._highlight_idle_chunk()
+    
+    cursor = QTextCursor(document)
+    cursor.setPosition(document.findBlockByNumber(removed_lines).position(),
+                       QTextCursor.KeepAnchor)
+    cursor.insertText(inserted)
+    
+    run_idle_chunks(qapp, highlighter)
+    assert plain_blocks(document) == []
@@ -0,0 +1,53 @@
+"""
+Test PlainTextCache copying a document's text once per edit.
+"""
+
+import pytest
+from PyQt5.QtGui import QTextCursor
+
+from code_editor.services import PlainTextCache
+
+
+@pytest.fixture
+def document(make_document):
+    """A document holding three lines."""
+    return make_document("alpha\nbeta\ngamma")
+
+
+@pytest.fixture
+def cache(document):
+    """A PlainTextCache over document."""
+    return PlainTextCache(document)
+
+
+def test_plain_text_follows_edits(document, cache):
+    """The cached text reflects insertions and removals."""
+    assert cache.plain_text() == "alpha\nbeta\ngamma"
+    
+    # Split "beta" into two lines
+    cursor = QTextCursor(document)
+    cursor.setPosition(8)
+    cursor.insertText("\n")
+    assert cache.plain_text() == "alpha\nbe\nta\ngamma"
+    
+    # Remove the first line and its newline
+    cursor.setPosition(0)
+    cursor.setPosition(6, QTextCursor.KeepAnchor)
+    cursor.removeSelectedText()
+    assert cache.plain_text() == "be\nta\ngamma"
+
+
+def test_plain_text_is_cached_between_edits(document, cache):
+    """The plain text is copied once per edit."""
+    first = cache.plain_text()
+    assert cache.plain_text() is first
+    QTextCursor(document).insertText("x")
+    assert cache.plain_text() == "x" + first
+
+
+def test_invalidate_copies_the_text_again(cache):
+    """invalidate() makes the next request copy the text out of Qt."""
+    first = cache.plain_text()
+    cache.invalidate()
+    second = cache.plain_text()
+    assert second == first and second is not first
@@ -2,7 +2,7 @@
 import sys
 from PyQt5.QtWidgets import QApplication
 from code_editor import CodeEditor
-from code_editor.highlighter import get_lexer_for_language
+from code_editor.highlighting import get_lexer_for_language
 
 app = QApplication([])
 editor = CodeEditor()
@@ -23,6 +23,7 @@ editor.show_search_popup()
 popup = editor._search_popup
 popup.regex_checkbox.setChecked(True)
 popup.search_input.setText(".*")
+popup.flush_pending_search()
 
 for _ in range(20):
     app.processEvents()
@@ -2,27 +2,15 @@
 Test search popup fixes: live search, Alt shortcuts, regex safety.
 """
 
-import sys
-from PyQt5.QtWidgets import QApplication
-from PyQt5.QtCore import Qt, QTimer
+import pytest
+from PyQt5.QtCore import Qt
 from PyQt5.QtTest import QTest
 
-from code_editor import CodeEditor
-from code_editor.highlighter import get_lexer_for_language
+from code_editor.services import DecorationLayer
+from code_editor.ui.search_popup import MAX_SEARCH_MATCHES, SEARCH_DEBOUNCE_MS
 
-app = QApplication([])
 
-print("Testing Search Popup Fixes")
-print("=" * 60)
-
-# Create editor
-editor = CodeEditor()
-lexer = get_lexer_for_language('python')
-editor.register_language('python', lexer)
-editor.set_language('python')
-
-# Set test code
-code = """def calculate_sum(numbers):
+CODE = """def calculate_sum(numbers):
     total = sum(numbers)
     return total
 
@@ -31,108 +19,142 @@ def calculate_average(numbers):
         return 0
     return sum(numbers) / len(numbers)
 """
-editor.setPlainText(code)
-
-# Test 1: Live search (textChanged instead of returnPressed)
-print("\n1. Testing live search (updates as you type)...")
-editor.show_search_popup()
-assert editor._search_popup is not None
-popup = editor._search_popup
-
-# Verify textChanged is connected, not returnPressed
-# The search should trigger automatically when text changes
-popup.search_input.setText("calc")
-app.processEvents()
-print("   ✅ Live search triggers on text change (not Enter)")
-
-# Test 2: Alt+C for case sensitivity
-print("\n2. Testing Alt+C toggle...")
-initial_case = popup.case_checkbox.isChecked()
-QTest.keyPress(popup, Qt.Key_C, Qt.AltModifier)
-app.processEvents()
-assert popup.case_checkbox.isChecked() != initial_case
-print("   ✅ Alt+C toggles case sensitivity")
-
-# Test 3: Alt+R for regex
-print("\n3. Testing Alt+R toggle...")
-initial_regex = popup.regex_checkbox.isChecked()
-QTest.keyPress(popup, Qt.Key_R, Qt.AltModifier)
-app.processEvents()
-assert popup.regex_checkbox.isChecked() != initial_regex
-print("   ✅ Alt+R toggles regex mode")
-
-# Test 4: Alt+W for whole word
-print("\n4. Testing Alt+W toggle...")
-initial_word = popup.whole_word_checkbox.isChecked()
-QTest.keyPress(popup, Qt.Key_W, Qt.AltModifier)
-app.processEvents()
-assert popup.whole_word_checkbox.isChecked() != initial_word
-print("   ✅ Alt+W toggles whole word")
-
-# Test 5: Regex crash test with .*
-print("\n5. Testing regex crash fix (pattern: .*)...")
-popup.regex_checkbox.setChecked(True)
-popup.search_input.clear()
-popup.search_input.setText(".*")
-app.processEvents()
-
-# Wait for search to complete
-for _ in range(10):
-    app.processEvents()
-
-# Check that we didn't crash and got reasonable results
-matches = len(editor._search_service.get_matches())
-print(f"   Found {matches} matches (should be reasonable, not thousands)")
-assert matches < 1000, "Regex .* should not create excessive matches"
-print("   ✅ Regex .* pattern doesn't crash")
-
-# Test 6: Enter in search popup doesn't modify editor
-print("\n6. Testing Enter key handling...")
-editor.setPlainText("test\nline")
-editor.show_search_popup()
-popup.search_input.setText("test")
-app.processEvents()
-
-# Record original text
-original_text = editor.toPlainText()
-
-# Press Enter in search popup (should navigate, not insert newline in editor)
-QTest.keyPress(popup.search_input, Qt.Key_Return)
-app.processEvents()
-
-# Editor text should be unchanged
-assert editor.toPlainText() == original_text
-print("   ✅ Enter in search popup doesn't modify editor text")
-
-# Test 7: Shift+Enter for previous match
-print("\n7. Testing Shift+Enter for previous...")
-# Set up search with multiple matches
-editor.setPlainText("test test test")
-popup.search_input.setText("test")
-app.processEvents()
-
-# Shift+Enter should go to previous (implemented in keyPressEvent)
-QTest.keyPress(popup.search_input, Qt.Key_Return, Qt.ShiftModifier)
-app.processEvents()
-print("   ✅ Shift+Enter handled for previous match")
-
-# Test 8: Escape closes popup
-print("\n8. Testing Escape closes popup...")
-editor.show_search_popup()
-assert popup.isVisible()
-QTest.keyPress(popup, Qt.Key_Escape)
-app.processEvents()
-# Popup should be hidden (closeRequested signal emitted)
-print("   ✅ Escape emits close signal")
-
-print("\n" + "=" * 60)
-print("ALL SEARCH FIXES VERIFIED! ✅")
-print("=" * 60)
-print("\nFixed issues:")
-print("  1. ✅ Live search (no Enter needed)")
-print("  2. ✅ Alt+C / Alt+R / Alt+W shortcuts")
-print("  3. ✅ Regex .* doesn't crash")
-print("  4. ✅ Enter/Shift+Enter don't affect editor")
-print("  5. ✅ Search popup takes focus")
-
-sys.exit(0)
+
+
+def has_search_highlights(editor):
+    """Check whether any search match is decorated in the editor."""
+    service = editor._decoration_service
+    return (service.has_decorations(DecorationLayer.SEARCH_MATCHES)
+            or service.has_decorations(DecorationLayer.CURRENT_MATCH))
+
+
+def test_live_search_on_text_change(code_editor, popup):
+    """Changing the pattern runs the search."""
+    popup.search_input.setText("calc")
+    popup.flush_pending_search()
+    assert len(code_editor._search_service.get_matches()) == 2
+
+
+@pytest.mark.parametrize("key, checkbox", [
+    (Qt.Key_C, "case_checkbox"),
+    (Qt.Key_R, "regex_checkbox"),
+    (Qt.Key_W, "whole_word_checkbox"),
+])
+def test_alt_toggles_on_popup(popup, key, checkbox):
+    """Alt+C/R/W sent to the popup toggle the options."""
+    box = getattr(popup, checkbox)
+    initial = box.isChecked()
+    QTest.keyPress(popup, key, Qt.AltModifier)
+    assert box.isChecked() != initial
+
+
+def test_regex_dot_star_is_safe(code_editor, popup):
+    """Searching for .* doesn't flood the editor with matches."""
+    popup.regex_checkbox.setChecked(True)
+    popup.search_input.setText(".*")
+    popup.flush_pending_search()
+    assert len(code_editor._search_service.get_matches()) < 1000
+
+
+def test_match_everything_regex_is_rejected(code_editor, popup):
+    """.* is reported as too broad instead of searched."""
+    popup.regex_checkbox.setChecked(True)
+    popup.search_input.setText(".*")
+    popup.flush_pending_search()
+    assert popup.match_label.text() == "Pattern too broad"
+
+
+@pytest.mark.parametrize("pattern, message", [
+    ("calc(", "Invalid regex"),
+    (".*", "Pattern too broad"),
+])
+def test_rejected_pattern_clears_previous_results(code_editor, popup, pattern, message):
+    """A pattern that isn't searched drops the results of the one before it."""
+    popup.regex_checkbox.setChecked(True)
+    popup.search_input.setText("calc")
+    popup.flush_pending_search()
+    assert len(code_editor._search_service.get_matches()) == 2
+    
+    popup.search_input.setText(pattern)
+    popup.flush_pending_search()
+    assert popup.match_label.text() == message
+    assert code_editor._search_service.get_matches() == []
+    assert not has_search_highlights(code_editor)
+    
+    # Enter has no stale matches to walk
+    QTest.keyPress(popup.search_input, Qt.Key_Return)
+    assert popup.match_label.text() == message
+
+
+@pytest.mark.parametrize("pattern, count", [
+    ("(calc)?ulate", 2),
+    ("n*umbers", 6),
+    ("a*ver?age", 1),
+])
+def test_regex_that_can_match_empty_text_is_searched(code_editor, popup, pattern, count):
+    """Regexes that can match empty text still find their non-empty matches."""
+    popup.regex_checkbox.setChecked(True)
+    popup.search_input.setText(pattern)
+    popup.flush_pending_search()
+    assert popup.match_label.text() != "Pattern too broad"
+    assert len(code_editor._search_service.get_matches()) == count
+
+
+def test_enter_does_not_modify_editor(code_editor, popup):
+    """Enter in the search input never reaches the document."""
+    code_editor.setPlainText("test\nline")
+    popup.search_input.setText("test")
+    
+    QTest.keyPress(popup.search_input, Qt.Key_Return)
+    assert code_editor.toPlainText() == "test\nline"
+
+
+def test_shift_enter_goes_to_previous(code_editor, popup):
+    """Shift+Enter moves to the previous match."""
+    code_editor.setPlainText("test test test")
+    popup.search_input.setText("test")
+    
+    # Enter flushes the pending search, Shift+Enter wraps back to the first
+    QTest.keyPress(popup.search_input, Qt.Key_Return)
+    QTest.keyPress(popup.search_input, Qt.Key_Return, Qt.ShiftModifier)
+    assert code_editor._search_service.get_current_index() == 0
+    assert code_editor.toPlainText() == "test test test"
+
+
+def test_escape_closes_popup(popup):
+    """Escape hides the popup."""
+    assert popup.isVisible()
+    QTest.keyPress(popup, Qt.Key_Escape)
+    assert not popup.isVisible()
+
+
+@pytest.mark.parametrize("close", [
+    lambda popup: QTest.keyPress(popup, Qt.Key_Escape),
+    lambda popup: popup.closeRequested.emit(),  # the × button
+], ids=["escape", "close_button"])
+def test_closing_drops_pending_search(code_editor, popup, close):
+    """Closing the popup before the debounce runs leaves nothing searched."""
+    popup.search_input.setText("calc")
+    close(popup)
+    assert not popup._search_debounce.isActive()
+    
+    # Longer than the debounce: a search left pending would have run by now
+    QTest.qWait(SEARCH_DEBOUNCE_MS * 2)
+    assert code_editor._search_service.get_matches() == []
+    assert not has_search_highlights(code_editor)
+    assert not code_editor.textCursor().hasSelection()
+
+
+@pytest.mark.parametrize("pattern, use_regex", [("foo", False), ("fo+", True)])
+def test_search_stops_at_the_match_cap(code_editor, popup, pattern, use_regex):
+    """A search over MAX_SEARCH_MATCHES keeps the first ones and shows "N+"."""
+    code_editor.setPlainText("foo " * (MAX_SEARCH_MATCHES + 5))
+    popup.regex_checkbox.setChecked(use_regex)
+    popup.search_input.setText(pattern)
+    popup.flush_pending_search()
+    
+    service = code_editor._search_service
+    assert len(service.get_matches()) == MAX_SEARCH_MATCHES
+    assert service.is_truncated()
+    assert service.get_matches()[-1].start == 4 * (MAX_SEARCH_MATCHES - 1)
+    assert popup.match_label.text() == f"1 of {MAX_SEARCH_MATCHES}+"
@@ -7,11 +7,12 @@ Tests:
 3. Highlights cleared when query changes to no matches
 """
 
+import os
 import sys
 from PyQt5.QtWidgets import QApplication
 from PyQt5.QtCore import QTimer
 from code_editor import CodeEditor
-from code_editor.highlighter import get_lexer_for_language
+from code_editor.highlighting import get_lexer_for_language
 
 
 def test_search_highlighting_fixes():
@@ -134,8 +135,11 @@ hello()
         print("All tests complete!")
         print("="*60)
         
-        # Close after all tests
-        QTimer.singleShot(2000, app.quit)
+        # Close right away; KEEP_OPEN=1 leaves the result on screen for 2 s
+        if os.environ.get('KEEP_OPEN'):
+            QTimer.singleShot(2000, app.quit)
+        else:
+            app.quit()
     
     # Start tests after a short delay
     QTimer.singleShot(500, run_tests)
@@ -3,26 +3,13 @@ Test the search popup functionality with screenshots.
 """
 
 import sys
-from PyQt5.QtWidgets import QApplication
-from PyQt5.QtCore import QTimer
 
-from code_editor import CodeEditor
-from code_editor.highlighter import get_lexer_for_language
+import pytest
+from PyQt5.QtGui import QImageWriter
 
-app = QApplication([])
 
-# Create editor
-editor = CodeEditor()
-editor.setWindowTitle("Search Popup Demo")
-editor.setGeometry(100, 100, 1000, 700)
-
-# Register Python
-lexer = get_lexer_for_language('python')
-editor.register_language('python', lexer)
-editor.set_language('python')
-
-# Set code with multiple matches
-code = """# Test Search Functionality
+# Code with multiple matches
+CODE = """# Test Search Functionality
 def calculate_sum(numbers):
     \"\"\"Calculate the sum of numbers.\"\"\"
     total = sum(numbers)
@@ -46,34 +33,41 @@ print(f"Sum: {calculate_sum(numbers)}")
 print(f"Avg: {calculate_average(numbers)}")
 print(f"Max: {calculate_max(numbers)}")
 """
-editor.setPlainText(code)
-
-# Set light theme for better visibility
-editor.set_theme('light')
-
-# Show editor
-editor.show()
 
-# Open search popup after a delay
-def open_search():
+def test_search_popup(qapp, editor, python_lexer, tmp_path):
+    """
+    Search for "calculate" and save a screenshot of the highlighted matches.
+    
+    The screenshot goes to pytest's per-test tmp_path; run pytest with
+    --basetemp to keep it somewhere predictable.
+    
+    The editor is never shown: grab() renders it, popup included, straight
+    into a pixmap. It starts out in the light theme.
+    """
+    editor.setWindowTitle("Search Popup Demo")
+    editor.resize(1000, 700)
+    
+    # Register Python
+    editor.register_language('python', python_lexer)
+    editor.set_language('python')
+    editor.setPlainText(CODE)
+    
+    # Search for "calculate" (case-insensitive by default)
     editor.show_search_popup()
-    # Simulate search for "calculate"
-    QTimer.singleShot(200, perform_search)
-
-def perform_search():
-    if editor._search_popup:
-        editor._search_popup.search_input.setText("calculate")
-        editor._search_popup._on_search()
-    QTimer.singleShot(300, take_screenshot)
-
-def take_screenshot():
-    pixmap = editor.grab()
-    pixmap.save('/tmp/search_popup_demo.png')
-    print("✓ Screenshot saved: /tmp/search_popup_demo.png")
-    print("✓ Search popup is visible")
-    print("✓ Multiple matches highlighted")
-    QTimer.singleShot(100, app.quit)
-
-QTimer.singleShot(500, open_search)
-
-sys.exit(app.exec_())
+    editor._search_popup.search_input.setText("calculate")
+    editor._search_popup._on_search()
+    qapp.processEvents()
+    
+    # isHidden: the popup is shown, but not visible while its editor isn't
+    assert not editor._search_popup.isHidden()
+    assert len(editor._search_service.get_matches()) == 10
+    
+    # Explicit format and the fastest zlib level: the file size of a
+    # preview image doesn't matter
+    writer = QImageWriter(str(tmp_path / "search_popup_demo.png"), b'PNG')
+    writer.setCompression(1)
+    assert writer.write(editor.grab().toImage()), writer.errorString()
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, "-v"]))
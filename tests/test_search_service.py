@@ -0,0 +1,222 @@
+"""
+Test SearchService match finding on plain documents (no editor widget).
+"""
+
+import random
+import re
+import time
+
+import pytest
+from PyQt5.QtGui import QTextCursor, QTextDocument
+
+from code_editor.ui.search_popup import SearchService, _iter_line_matches
+
+
+# Letters whose case folding differs between str.lower() and re.IGNORECASE,
+# or whose lowercase has a different length, mixed with plain ASCII
+FOLD_ALPHABET = "sSſσςΣİiIıkKKßẞéÉ_ -"
+
+
+def service_spans(text, pattern, case_sensitive=False, whole_word=False):
+    """Run a literal SearchService search over text, returning (start, end) pairs."""
+    service = SearchService(QTextDocument(), text_source=lambda: text)
+    service.search(pattern, case_sensitive=case_sensitive, whole_word=whole_word)
+    return [(m.start, m.end) for m in service.get_matches()]
+
+
+def regex_spans(text, pattern, case_sensitive=False, whole_word=False):
+    """The spans the regex engine finds for an escaped literal pattern."""
+    body = re.escape(pattern)
+    if whole_word:
+        body = rf"\b(?:{body})\b"
+    regex = re.compile(body, 0 if case_sensitive else re.IGNORECASE)
+    return [m.span() for m in regex.finditer(text) if m.start() != m.end()]
+
+
+@pytest.mark.parametrize("whole_word", [False, True])
+@pytest.mark.parametrize("case_sensitive", [False, True])
+def test_literal_search_matches_regex_on_non_ascii(qapp, case_sensitive, whole_word):
+    """Literal search finds what the regex engine finds, beyond ASCII too."""
+    rng = random.Random(1234)
+    for _ in range(2000):
+        text = "".join(rng.choice(FOLD_ALPHABET) for _ in range(rng.randint(0, 24)))
+        pattern = "".join(rng.choice(FOLD_ALPHABET) for _ in range(rng.randint(1, 3)))
+        expected = regex_spans(text, pattern, case_sensitive, whole_word)
+        assert service_spans(text, pattern, case_sensitive, whole_word) == expected, \
+            (text, pattern)
+
+
+@pytest.mark.parametrize("text, pattern, expected", [
+    ("ſun sun", "SUN", [(0, 3), (4, 7)]),
+    ("ΣΑΣ σας", "σας", [(0, 3), (4, 7)]),
+    # "İ".lower() is two code points; later hits must not shift
+    ("İx ix", "x", [(1, 2), (4, 5)]),
+])
+def test_case_insensitive_folding(qapp, text, pattern, expected):
+    """Case-insensitive search folds case as re.IGNORECASE does."""
+    assert service_spans(text, pattern) == expected
+
+
+def per_line_spans(text, pattern):
+    """Reference: the non-empty matches of a regex searched line by line."""
+    regex = re.compile(pattern, re.IGNORECASE)
+    spans = []
+    offset = 0
+    for line in text.split("\n"):
+        spans.extend((offset + m.start(), offset + m.end())
+                     for m in regex.finditer(line) if m.start() != m.end())
+        offset += len(line) + 1
+    return spans
+
+
+@pytest.mark.parametrize("pattern", [r"\s+", r"[^x]+", r"a\sb", r"b$", r"^\w", r"a*b?"])
+def test_regex_matches_stay_within_lines(qapp, pattern):
+    """Regex matches end at the end of the line they start on."""
+    text = "a  \n  b\n\nxa b\na\nb x\n"
+    service = SearchService(QTextDocument(), text_source=lambda: text)
+    service.search(pattern, use_regex=True)
+    spans = [(m.start, m.end) for m in service.get_matches()]
+    assert spans == per_line_spans(text, pattern)
+    assert all("\n" not in m.text for m in service.get_matches())
+
+
+def test_literal_pattern_with_newline_finds_nothing(qapp):
+    """A literal pattern spanning lines has no matches."""
+    text = "a\nb"
+    service = SearchService(QTextDocument(), text_source=lambda: text)
+    assert service.search("a\nb") == 0
+
+
+def best_time(func, repeat=3):
+    """The fastest of a few timed calls of func, in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def test_line_crossing_pattern_scan_is_linear():
+    """A pattern that runs to the end of the text costs about a per-line scan."""
+    # Without "#", every [^#]+ match starts a line and runs over the rest
+    text = "x = 1\n" * 30000
+    regex = re.compile(r"[^#]+")
+    
+    def scan():
+        assert sum(1 for _ in _iter_line_matches(regex, text)) == 30000
+    
+    def per_line():
+        for line in text.split("\n"):
+            for _ in regex.finditer(line):
+                pass
+    
+    # Restarting the whole-text scan after each crossing match is quadratic
+    # (seconds at this size); a line-by-line scan is a few milliseconds
+    assert best_time(scan) < 10 * best_time(per_line)
+
+
+@pytest.fixture
+def searched_document(make_document):
+    """A document and a service that found "foo" in it."""
+    document = make_document("foo bar foo\nfoo")
+    service = SearchService(document)
+    assert service.search("foo") == 3
+    return document, service
+
+
+def edit(document, position, removed, inserted):
+    """Replace removed characters at position with inserted text."""
+    cursor = QTextCursor(document)
+    cursor.setPosition(position)
+    cursor.setPosition(position + removed, QTextCursor.KeepAnchor)
+    cursor.insertText(inserted)
+
+
+def match_spans(service):
+    """(start, end) of every current match."""
+    return [(m.start, m.end) for m in service.get_matches()]
+
+
+@pytest.mark.parametrize("position, removed, inserted, expected", [
+    # Before every match: all of them shift
+    (0, 0, "xx", [(2, 5), (10, 13), (14, 17)]),
+    # At a match's start: that match shifts with the rest
+    (8, 0, "x", [(0, 3), (9, 12), (13, 16)]),
+    # At a match's end: that match stays
+    (11, 0, "x", [(0, 3), (8, 11), (13, 16)]),
+    # Inside a match: only that match is dropped
+    (9, 0, "x", [(0, 3), (13, 16)]),
+    # Removal overlapping a match: dropped, later ones shift back
+    (6, 3, "", [(0, 3), (9, 12)]),
+    # Between matches: later ones shift
+    (4, 3, "b", [(0, 3), (6, 9), (10, 13)]),
+    # After every match: nothing moves
+    (15, 0, "!", [(0, 3), (8, 11), (12, 15)]),
+])
+def test_matches_follow_edits(searched_document, position, removed, inserted, expected):
+    """Match positions shift with edits, and edited matches are dropped."""
+    document, service = searched_document
+    edit(document, position, removed, inserted)
+    spans = match_spans(service)
+    assert spans == expected
+    text = document.toPlainText()
+    assert all(text[start:end] == "foo" for start, end in spans)
+
+
+def test_current_match_follows_edits(searched_document):
+    """The current match survives edits to other matches."""
+    document, service = searched_document
+    service.next_match()
+    assert service.get_current_index() == 1
+    
+    # Dropping the current match moves on to the one after it
+    edit(document, 9, 0, "x")
+    assert service.get_current_match().start == 13
+    
+    # Dropping an earlier match keeps the current one
+    edit(document, 1, 0, "x")
+    assert (service.get_current_match().start, len(service.get_matches())) == (14, 1)
+
+
+@pytest.mark.parametrize("start, end, expected", [
+    (0, 3, [(0, 3)]),
+    # Ranges touching a match's end or start don't include it
+    (3, 8, []),
+    (2, 9, [(0, 3), (8, 11)]),
+    (9, 10, [(8, 11)]),
+    (11, 100, [(12, 15)]),
+    (15, 100, []),
+])
+def test_matches_in_range(searched_document, start, end, expected):
+    """get_matches_in_range returns the matches overlapping [start, end)."""
+    _, service = searched_document
+    spans = [(m.start, m.end) for m in service.get_matches_in_range(start, end)]
+    assert spans == expected
+
+
+@pytest.mark.parametrize("pattern, use_regex", [
+    ("foo", False),
+    ("FOO", False),  # case-insensitive, non-ASCII text: regex path
+    (r"f\w+", True),
+])
+def test_positions_after_astral_characters(qapp, pattern, use_regex):
+    """Match positions count characters outside the BMP as two."""
+    # Each emoji is one str index but two document positions
+    document = QTextDocument("😀 foo 🎉🎉 foo\n🐍foo")
+    service = SearchService(document)
+    assert service.search(pattern, use_regex=use_regex) == 3
+    
+    starts = [m.cursor.selectionStart() for m in service.get_matches()]
+    assert starts == [3, 12, 18]
+    assert [m.cursor.selectedText() for m in service.get_matches()] == ["foo"] * 3
+
+
+def test_editor_selects_match_after_astral_characters(editor):
+    """The editor selects a match that follows astral characters."""
+    editor.setPlainText("🎉🎉🎉 foo")
+    assert editor.search("foo") == 1
+    
+    cursor = editor._search_service.get_current_match().cursor
+    assert (cursor.selectionStart(), cursor.selectionEnd()) == (7, 10)
+    assert cursor.selectedText() == "foo"
@@ -0,0 +1,60 @@
+"""
+Test that search highlights cover only the visible part of the document.
+"""
+
+import pytest
+
+
+LINE_COUNT = 500
+
+
+@pytest.fixture
+def searched_editor(qapp, editor):
+    """A shown, short editor that found "foo" on every one of its lines."""
+    editor.setPlainText("foo\n" * LINE_COUNT)
+    editor.resize(400, 200)
+    editor.show()
+    qapp.processEvents()
+    assert editor.search("foo") == LINE_COUNT
+    return editor
+
+
+def highlighted_lines(editor):
+    """Block numbers of the search match highlights set on the editor."""
+    color = editor.get_current_theme().search_match
+    return [s.cursor.blockNumber() for s in editor.extraSelections()
+            if s.format.background().color() == color]
+
+
+def visible_lines(editor):
+    """Block numbers of the lines the viewport shows."""
+    start, end = editor._visible_position_range()
+    document = editor.document()
+    return range(document.findBlock(start).blockNumber(),
+                 document.findBlock(end - 1).blockNumber() + 1)
+
+
+def test_only_visible_matches_are_highlighted(searched_editor):
+    """Matches outside the viewport get no highlight."""
+    lines = highlighted_lines(searched_editor)
+    assert lines == list(visible_lines(searched_editor))
+    assert 0 < len(lines) < LINE_COUNT
+
+
+def test_scrolling_highlights_matches_in_view(qapp, searched_editor):
+    """Scrolling rebuilds the highlights for the lines brought into view."""
+    searched_editor.verticalScrollBar().setValue(300)
+    qapp.processEvents()
+    
+    lines = highlighted_lines(searched_editor)
+    assert lines == list(visible_lines(searched_editor))
+    assert lines[0] == 300
+
+
+def test_closed_search_stays_cleared_on_scroll(qapp, searched_editor):
+    """Scrolling after the search is cleared brings no highlights back."""
+    searched_editor.clear_search()
+    searched_editor.verticalScrollBar().setValue(300)
+    qapp.processEvents()
+    assert highlighted_lines(searched_editor) == []
+
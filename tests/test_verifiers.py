@@ -0,0 +1,22 @@
+"""
+Run the source-level verifier scripts under pytest.
+
+The verifiers inspect the source files rather than a running editor, so
+these tests need no widgets; a failure lists the names of the checks that
+didn't pass.
+"""
+
+import verify_fixes
+import verify_vscode_paste
+
+
+def test_search_highlighting_fixes():
+    """Every check in verify_fixes passes."""
+    results = verify_fixes._verify()
+    assert all(ok for _, ok in results), [name for name, ok in results if not ok]
+
+
+def test_vscode_paste_implementation():
+    """Every check in verify_vscode_paste passes."""
+    results = verify_vscode_paste._verify()
+    assert all(ok for _, ok in results), [name for name, ok in results if not ok]
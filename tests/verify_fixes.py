@@ -1,108 +1,162 @@
 """
 Simple verification of the search highlighting fixes.
 
-This script verifies the code changes without requiring GUI.
+This script verifies the code changes without requiring GUI. Each source
+file is parsed once and the checks inspect its syntax tree, so they don't
+depend on formatting.
 """
 
-def verify_search_fixes():
-    """Verify search highlighting fix implementation."""
-    print("Verifying search highlighting fixes...")
-    print("="*60)
+import ast
+import os
+import sys
+from typing import List, Tuple
+
+PACKAGE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           'src', 'code_editor')
+
+# Sources probed by the checks, relative to PACKAGE_DIR
+SOURCES = {
+    'editor': os.path.join('ui', 'editor_widget.py'),
+    'search': os.path.join('ui', 'search_popup.py'),
+    'goto': os.path.join('ui', 'goto_line_overlay.py'),
+}
+
+
+def parse_sources() -> dict:
+    """Parse every probed source file once, keyed like SOURCES."""
+    trees = {}
+    for key, path in SOURCES.items():
+        with open(os.path.join(PACKAGE_DIR, path), 'r', encoding='utf-8') as f:
+            trees[key] = ast.parse(f.read(), filename=path)
+    return trees
+
+
+def find_function(tree: ast.AST, name: str):
+    """Get the first function or method definition with the given name, or None."""
+    for node in ast.walk(tree):
+        if isinstance(node, ast.FunctionDef) and node.name == name:
+            return node
+    return None
+
+
+def method_calls(node: ast.AST, method: str) -> list:
+    """Get the calls of ``<something>.<method>(...)`` under node, in source order."""
+    calls = [n for n in ast.walk(node)
+             if isinstance(n, ast.Call) and isinstance(n.func, ast.Attribute)
+             and n.func.attr == method]
+    return sorted(calls, key=lambda n: (n.lineno, n.col_offset))
+
+
+def first_arg_attr(call: ast.Call):
+    """Get the attribute name of a call's first argument (``X.attr``), or None."""
+    if call.args and isinstance(call.args[0], ast.Attribute):
+        return call.args[0].attr
+    return None
+
+
+def clears_layer(call: ast.Call, layer: str) -> bool:
+    """Check whether a clear_layer call clears the given DecorationLayer."""
+    return first_arg_attr(call) == layer
+
+
+def _verify() -> List[Tuple[str, bool]]:
+    """
+    Run every check against the parsed sources.
+    
+    Returns:
+        List of (check name, passed) pairs in check order
+    """
+    results = []
+    
+    def check(name, ok):
+        results.append((name, bool(ok)))
+    
+    trees = parse_sources()
     
     # Check 1: _on_search_closed clears highlights
-    print("\n1. Checking _on_search_closed() implementation...")
-    with open('code_editor/core.py', 'r') as f:
-        content = f.read()
-        
-    # Find the _on_search_closed method
-    if 'def _on_search_closed(self)' in content:
-        method_start = content.find('def _on_search_closed(self)')
-        method_section = content[method_start:method_start+500]
-        
-        has_clear_search = "clear_decorations('search')" in method_section
-        has_clear_current = "clear_decorations('current_match')" in method_section
-        has_apply = "_apply_decorations()" in method_section
-        
-        if has_clear_search and has_clear_current and has_apply:
-            print("   ✓ PASS: Clears 'search' decorations")
-            print("   ✓ PASS: Clears 'current_match' decorations")
-            print("   ✓ PASS: Applies decorations (refreshes display)")
-        else:
-            print(f"   ✗ FAIL: Missing clear calls")
-            print(f"      - clear_search: {has_clear_search}")
-            print(f"      - clear_current: {has_clear_current}")
-            print(f"      - apply: {has_apply}")
+    method = find_function(trees['editor'], '_on_search_closed')
+    check("_on_search_closed() exists", method)
+    if method:
+        clears = method_calls(method, 'clear_layer')
+        check("_on_search_closed() clears 'search' decorations",
+              any(clears_layer(c, 'SEARCH_MATCHES') for c in clears))
+        check("_on_search_closed() clears 'current_match' decorations",
+              any(clears_layer(c, 'CURRENT_MATCH') for c in clears))
+        check("_on_search_closed() applies decorations (refreshes display)",
+              any(isinstance(c.func.value, ast.Attribute)
+                  and c.func.value.attr == '_decoration_service'
+                  for c in method_calls(method, 'apply')))
     
     # Check 2: _on_search_requested clears highlights at start
-    print("\n2. Checking _on_search_requested() implementation...")
-    if 'def _on_search_requested(self, pattern: str' in content:
-        method_start = content.find('def _on_search_requested(self, pattern: str')
-        method_section = content[method_start:method_start+1500]
-        
-        # Find position of first clear_decorations call
-        first_clear = method_section.find("clear_decorations('search')")
-        # Find position of search service call
-        search_call = method_section.find("self._search_service.search(")
+    method = find_function(trees['editor'], '_on_search_requested')
+    check("_on_search_requested() exists", method)
+    if method:
+        # First clear of the match layer and first search service call
+        first_clear = next((c for c in method_calls(method, 'clear_layer')
+                            if clears_layer(c, 'SEARCH_MATCHES')), None)
+        search_call = next((c for c in method_calls(method, 'search')
+                            if isinstance(c.func.value, ast.Attribute)
+                            and c.func.value.attr == '_search_service'), None)
+        check("_on_search_requested() clears decorations BEFORE searching",
+              first_clear and search_call and first_clear.lineno < search_call.lineno)
         
-        if first_clear < search_call and first_clear > 0:
-            print("   ✓ PASS: Clears decorations BEFORE searching")
-        else:
-            print("   ✗ FAIL: Decorations not cleared early enough")
-        
-        # Check for empty pattern handling
-        if "if not pattern:" in method_section:
-            print("   ✓ PASS: Handles empty pattern")
-        else:
-            print("   ✗ WARNING: May not handle empty pattern")
+        # Check for empty pattern handling (``if not pattern:``)
+        check("_on_search_requested() handles empty pattern", any(
+            isinstance(n, ast.If) and isinstance(n.test, ast.UnaryOp)
+            and isinstance(n.test.op, ast.Not) and isinstance(n.test.operand, ast.Name)
+            and n.test.operand.id == 'pattern'
+            for n in ast.walk(method)))
     
     # Check 3: update_match_count shows "No results"
-    print("\n3. Checking update_match_count() in SearchPopup...")
-    with open('code_editor/search.py', 'r') as f:
-        search_content = f.read()
-    
-    if 'def update_match_count(self, current: int, total: int)' in search_content:
-        method_start = search_content.find('def update_match_count(self, current: int, total: int)')
-        method_section = search_content[method_start:method_start+800]
-        
-        has_no_results = '"No results"' in method_section or "'No results'" in method_section
-        has_red_color = '#cc0000' in method_section or 'cc0000' in method_section
-        
-        if has_no_results and has_red_color:
-            print("   ✓ PASS: Shows 'No results' text")
-            print("   ✓ PASS: Uses red color (#cc0000)")
-        else:
-            print(f"   ✗ FAIL: Missing proper 'No results' display")
-            print(f"      - 'No results' text: {has_no_results}")
-            print(f"      - Red color: {has_red_color}")
+    method = find_function(trees['search'], 'update_match_count')
+    check("SearchPopup.update_match_count() exists", method)
+    if method:
+        check("update_match_count() shows 'No results' text",
+              any(isinstance(n, ast.Constant) and n.value == "No results"
+                  for n in ast.walk(method)))
+        # The red style is a class constant used by the method
+        uses_red = any(isinstance(n, ast.Attribute) and n.attr == '_STYLE_RED'
+                       for n in ast.walk(method))
+        red_is_cc0000 = any(
+            isinstance(n, ast.Assign)
+            and any(isinstance(t, ast.Name) and t.id == '_STYLE_RED' for t in n.targets)
+            and isinstance(n.value, ast.Constant) and '#cc0000' in str(n.value.value)
+            for n in ast.walk(trees['search']))
+        check("update_match_count() uses red color (#cc0000)", uses_red and red_is_cc0000)
     
     # Check 4: Goto line overlay width
-    print("\n4. Checking GotoLineOverlay info_label width...")
-    with open('code_editor/goto_line_overlay.py', 'r') as f:
-        goto_content = f.read()
+    width_call = next((c for c in method_calls(trees['goto'], 'setMinimumWidth')
+                       if isinstance(c.func.value, ast.Attribute)
+                       and c.func.value.attr == 'info_label'), None)
+    width = None
+    if width_call and width_call.args and isinstance(width_call.args[0], ast.Constant):
+        width = width_call.args[0].value
+    check(f"GotoLineOverlay info_label width >= 150px (got {width})",
+          width is not None and width >= 150)
     
-    if 'self.info_label.setMinimumWidth(' in goto_content:
-        # Extract the width value
-        width_start = goto_content.find('self.info_label.setMinimumWidth(')
-        width_section = goto_content[width_start:width_start+100]
-        
-        # Look for the number
-        import re
-        match = re.search(r'setMinimumWidth\((\d+)\)', width_section)
-        if match:
-            width = int(match.group(1))
-            if width >= 150:
-                print(f"   ✓ PASS: Info label width set to {width}px (>= 150px)")
-            else:
-                print(f"   ✗ FAIL: Info label width only {width}px (should be >= 150px)")
-        else:
-            print("   ✗ FAIL: Could not parse width value")
-    else:
-        print("   ✗ FAIL: Info label minimum width not set")
+    return results
+
+
+def render(results: List[Tuple[str, bool]]) -> str:
+    """Format check results as one report line per check."""
+    return "\n".join(("  ✓ " if ok else "  ✗ ") + name for name, ok in results)
+
+
+def verify_search_fixes() -> List[Tuple[str, bool]]:
+    """
+    Verify search highlighting fix implementation and print the report.
     
-    print("\n" + "="*60)
-    print("Verification complete!")
-    print("="*60)
+    Returns:
+        List of (check name, passed) pairs in check order
+    """
+    results = _verify()
+    passed = sum(ok for _, ok in results)
+    sys.stdout.write("Verifying search highlighting fixes...\n"
+                     + render(results)
+                     + f"\n{passed}/{len(results)} checks passed\n")
+    return results
 
 
 if __name__ == '__main__':
-    verify_search_fixes()
+    results = verify_search_fixes()
+    sys.exit(0 if all(ok for _, ok in results) else 1)
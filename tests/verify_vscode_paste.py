@@ -4,156 +4,137 @@ Verify VS Code-style paste implementation.
 Checks the code for proper implementation without requiring GUI.
 """
 
-def verify_vscode_paste():
-    """Verify VS Code-style paste implementation."""
-    print("Verifying VS Code-style paste implementation...")
-    print("="*60)
+import os
+import re
+import sys
+from typing import List, Tuple
+
+PACKAGE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           'src', 'code_editor')
+
+# Sources probed by the checks, relative to PACKAGE_DIR
+SOURCES = {
+    'core': os.path.join('ui', 'editor_widget.py'),
+    'shortcuts': os.path.join('controllers', 'shortcut_controller.py'),
+}
+
+
+def method_re(name: str) -> "re.Pattern":
+    """
+    Compile a pattern matching a function from its def line to its end.
     
-    # Check 1: _last_copy_was_line flag exists
-    print("\n1. Checking _last_copy_was_line flag...")
-    with open('code_editor/core.py', 'r') as f:
-        core_content = f.read()
+    The body runs until the next non-blank line indented no deeper than the
+    def itself, whatever the indentation width and signature.
+    """
+    return re.compile(rf"^([ \t]*)def {name}\b.*?(?=^(?!\1[ \t])[ \t]*\S|\Z)",
+                      re.MULTILINE | re.DOTALL)
+
+
+COPY_LINE_RE = method_re('copy_line')
+CUT_LINE_RE = method_re('cut_line')
+PASTE_LINE_RE = method_re('paste_line')
+KEY_PRESS_EVENT_RE = method_re('keyPressEvent')
+
+
+def read_sources() -> dict:
+    """Read every probed source file once, keyed like SOURCES."""
+    files = {}
+    for key, path in SOURCES.items():
+        with open(os.path.join(PACKAGE_DIR, path), 'r', encoding='utf-8') as f:
+            files[key] = f.read()
+    return files
+
+
+def _verify() -> List[Tuple[str, bool]]:
+    """
+    Run every check against the source files.
+    
+    Returns:
+        List of (check name, passed) pairs in check order
+    """
+    results = []
     
-    if '_last_copy_was_line' in core_content:
-        # Find initialization
-        if 'self._last_copy_was_line: bool = False' in core_content or \
-           'self._last_copy_was_line = False' in core_content:
-            print("   ✓ PASS: _last_copy_was_line flag initialized")
-        else:
-            print("   ✗ WARNING: Flag exists but may not be initialized")
-    else:
-        print("   ✗ FAIL: _last_copy_was_line flag not found")
+    def check(name, ok):
+        results.append((name, bool(ok)))
     
-    # Check 2: copy_line sets flag and adds newline
-    print("\n2. Checking copy_line() implementation...")
-    with open('code_editor/shortcuts.py', 'r') as f:
-        shortcuts_content = f.read()
+    files = read_sources()
+    core_content = files['core']
+    shortcuts_content = files['shortcuts']
     
-    if 'def copy_line(self)' in shortcuts_content:
-        method_start = shortcuts_content.find('def copy_line(self)')
-        method_section = shortcuts_content[method_start:method_start+800]
-        
-        has_newline = "text() + '\\n'" in method_section or 'text() + "\\n"' in method_section
-        sets_flag = '_last_copy_was_line = True' in method_section
-        
-        if has_newline:
-            print("   ✓ PASS: Adds newline to copied text")
-        else:
-            print("   ✗ FAIL: Doesn't add newline to mark as line copy")
-        
-        if sets_flag:
-            print("   ✓ PASS: Sets _last_copy_was_line = True")
-        else:
-            print("   ✗ FAIL: Doesn't set line copy flag")
+    # Check 1: _last_copy_was_line flag exists and is initialized
+    check("_last_copy_was_line flag exists", '_last_copy_was_line' in core_content)
+    check("_last_copy_was_line flag initialized",
+          'self._last_copy_was_line: bool = False' in core_content
+          or 'self._last_copy_was_line = False' in core_content)
     
-    # Check 3: cut_line sets flag and adds newline
-    print("\n3. Checking cut_line() implementation...")
-    if 'def cut_line(self)' in shortcuts_content:
-        method_start = shortcuts_content.find('def cut_line(self)')
-        method_section = shortcuts_content[method_start:method_start+900]
-        
-        has_newline = "text() + '\\n'" in method_section or 'text() + "\\n"' in method_section
-        sets_flag = '_last_copy_was_line = True' in method_section
-        
-        if has_newline:
-            print("   ✓ PASS: Adds newline to cut text")
-        else:
-            print("   ✗ FAIL: Doesn't add newline to mark as line copy")
-        
-        if sets_flag:
-            print("   ✓ PASS: Sets _last_copy_was_line = True")
-        else:
-            print("   ✗ FAIL: Doesn't set line copy flag")
+    # Checks 2-3: copy_line/cut_line set the flag and add a newline
+    for name, pattern in (('copy_line', COPY_LINE_RE), ('cut_line', CUT_LINE_RE)):
+        m = pattern.search(shortcuts_content)
+        check(f"{name}() found", m)
+        if m:
+            method_section = m.group(0)
+            check(f"{name}() adds newline to mark a line copy",
+                  "+ '\\n'" in method_section or '+ "\\n"' in method_section)
+            check(f"{name}() sets _last_copy_was_line = True",
+                  '_last_copy_was_line = True' in method_section)
     
     # Check 4: paste_line method exists and checks flag
-    print("\n4. Checking paste_line() implementation...")
-    if 'def paste_line(self)' in core_content:
-        method_start = core_content.find('def paste_line(self)')
-        method_section = core_content[method_start:method_start+1500]
-        
-        checks_flag = 'if self._last_copy_was_line' in method_section
-        checks_newline = "text.endswith('\\n')" in method_section or 'text.endswith("\\n")' in method_section
-        inserts_at_start = 'movePosition(QTextCursor.StartOfBlock)' in method_section
-        resets_flag = '_last_copy_was_line = False' in method_section
-        
-        if checks_flag:
-            print("   ✓ PASS: Checks _last_copy_was_line flag")
-        else:
-            print("   ✗ FAIL: Doesn't check line copy flag")
-        
-        if checks_newline:
-            print("   ✓ PASS: Checks if text ends with newline")
-        else:
-            print("   ✗ FAIL: Doesn't check for newline")
-        
-        if inserts_at_start:
-            print("   ✓ PASS: Inserts at start of line (VS Code behavior)")
-        else:
-            print("   ✗ FAIL: Doesn't insert at start of line")
-        
-        if resets_flag:
-            print("   ✓ PASS: Resets flag after paste")
-        else:
-            print("   ✗ WARNING: May not reset flag after paste")
-    else:
-        print("   ✗ FAIL: paste_line() method not found")
+    m = PASTE_LINE_RE.search(core_content)
+    check("paste_line() found", m)
+    if m:
+        method_section = m.group(0)
+        check("paste_line() checks _last_copy_was_line flag",
+              'if self._last_copy_was_line' in method_section)
+        check("paste_line() checks if text ends with newline",
+              "text.endswith('\\n')" in method_section
+              or 'text.endswith("\\n")' in method_section)
+        check("paste_line() inserts at start of line (VS Code behavior)",
+              'movePosition(QTextCursor.StartOfBlock)' in method_section)
+        check("paste_line() resets flag after paste",
+              '_last_copy_was_line = False' in method_section)
     
     # Check 5: keyPressEvent handles Ctrl+V
-    print("\n5. Checking keyPressEvent() for Ctrl+V...")
-    if 'def keyPressEvent(self, event)' in core_content:
-        method_start = core_content.find('def keyPressEvent(self, event)')
-        method_section = core_content[method_start:method_start+1500]
-        
-        handles_v = 'Qt.Key_V' in method_section
-        calls_paste_line = 'self.paste_line()' in method_section
-        resets_on_normal_copy = '_last_copy_was_line = False' in method_section
-        
-        if handles_v:
-            print("   ✓ PASS: Handles Ctrl+V key")
-        else:
-            print("   ✗ FAIL: Doesn't handle Ctrl+V")
-        
-        if calls_paste_line:
-            print("   ✓ PASS: Calls paste_line()")
-        else:
-            print("   ✗ FAIL: Doesn't call paste_line()")
-        
-        if resets_on_normal_copy:
-            print("   ✓ PASS: Resets flag on normal copy/cut with selection")
-        else:
-            print("   ✗ WARNING: May not reset flag on normal operations")
+    m = KEY_PRESS_EVENT_RE.search(core_content)
+    check("keyPressEvent() found", m)
+    if m:
+        method_section = m.group(0)
+        check("keyPressEvent() handles Ctrl+V key", 'Qt.Key_V' in method_section)
+        check("keyPressEvent() calls paste_line()", 'self.paste_line()' in method_section)
+        check("keyPressEvent() resets flag on normal copy/cut with selection",
+              '_last_copy_was_line = False' in method_section)
     
     # Check 6: Public API methods exist
-    print("\n6. Checking public API methods...")
-    has_copy_line_api = 'def copy_line(self)' in core_content and \
-                        'Copy the current line to clipboard' in core_content
-    has_cut_line_api = 'def cut_line(self)' in core_content and \
-                       'Cut the current line to clipboard' in core_content
-    has_paste_line_api = 'def paste_line(self)' in core_content
-    
-    if has_copy_line_api:
-        print("   ✓ PASS: copy_line() in public API")
-    else:
-        print("   ✗ FAIL: copy_line() not in public API")
-    
-    if has_cut_line_api:
-        print("   ✓ PASS: cut_line() in public API")
-    else:
-        print("   ✗ FAIL: cut_line() not in public API")
+    check("copy_line() in public API",
+          'def copy_line(self)' in core_content
+          and 'Copy the current line to clipboard' in core_content)
+    check("cut_line() in public API",
+          'def cut_line(self)' in core_content
+          and 'Cut the current line to clipboard' in core_content)
+    check("paste_line() in public API", 'def paste_line(self)' in core_content)
     
-    if has_paste_line_api:
-        print("   ✓ PASS: paste_line() in public API")
-    else:
-        print("   ✗ FAIL: paste_line() not in public API")
+    return results
+
+
+def render(results: List[Tuple[str, bool]]) -> str:
+    """Format check results as one report line per check."""
+    return "\n".join(("  ✓ " if ok else "  ✗ ") + name for name, ok in results)
+
+
+def verify_vscode_paste() -> List[Tuple[str, bool]]:
+    """
+    Verify VS Code-style paste implementation and print the report.
     
-    print("\n" + "="*60)
-    print("Verification complete!")
-    print("="*60)
-    print("\nSummary:")
-    print("- VS Code-style paste inserts full lines as new lines")
-    print("- Normal copy/paste with selection works as before")
-    print("- Flag tracking ensures correct behavior")
+    Returns:
+        List of (check name, passed) pairs in check order
+    """
+    results = _verify()
+    passed = sum(ok for _, ok in results)
+    sys.stdout.write("Verifying VS Code-style paste implementation...\n"
+                     + render(results)
+                     + f"\n{passed}/{len(results)} checks passed\n")
+    return results
 
 
 if __name__ == '__main__':
-    verify_vscode_paste()
+    results = verify_vscode_paste()
+    sys.exit(0 if all(ok for _, ok in results) else 1)